@@ -0,0 +1,91 @@
+# app/cache.py
+
+import streamlit as st
+
+from config.constants import METRIC_NAMES
+from config.settings import settings
+from core.aggregator import collect_all_data
+from core.similarity import get_similarity_index
+from visualizations.map_view import make_click_map
+from visualizations.radial_chart import plot_radial
+from visualizations.score_map import plot_score_map
+
+# Shared across sessions; arguments form the cache key.
+# Snapshot-derived results also take the snapshot version so a rebuild
+# invalidates them without waiting for the TTL.
+_TTL = settings.STREAMLIT_CACHE_TTL_SECONDS
+_MAX_ENTRIES = settings.STREAMLIT_CACHE_MAX_ENTRIES
+
+
+@st.cache_data(ttl=_TTL, max_entries=_MAX_ENTRIES, show_spinner=False)
+def zip_data(zip_code: str, _collect=collect_all_data) -> dict:
+    """
+    collect_all_data, skipping the Supabase round trip for ZIPs any session
+    looked at recently. On a miss `_collect` (not part of the key) fetches
+    the data; nothing is cached when it raises.
+    """
+    return _collect(zip_code)
+
+
+class _NotCached(Exception):
+    pass
+
+
+def _not_cached(zip_code: str) -> dict:
+    raise _NotCached(zip_code)
+
+
+def cached_zip_data(zip_code: str) -> dict | None:
+    """
+    zip_data for a ZIP already in the cache, else None (nothing is fetched).
+    """
+    try:
+        return zip_data(zip_code, _collect=_not_cached)
+    except _NotCached:
+        return None
+
+
+def remember_zip_data(zip_code: str, data: dict):
+    """
+    Puts complete raw data collected elsewhere (the progressive Analyze
+    flow) into zip_data, so later views skip the fetch.
+    """
+    zip_data(zip_code, _collect=lambda _: data)
+
+
+@st.cache_data(ttl=_TTL, max_entries=_MAX_ENTRIES, show_spinner=False)
+def radial_figure(metric_scores: dict):
+    return plot_radial(metric_scores)
+
+
+@st.cache_resource(ttl=_TTL, max_entries=_MAX_ENTRIES, show_spinner=False)
+def click_map(zip_code: str):
+    # Read-only render object: shared, not copied per rerun
+    return make_click_map(zip_code)
+
+
+@st.cache_data(ttl=_TTL, max_entries=_MAX_ENTRIES, show_spinner=False)
+def _most_similar(
+    zip_code: str, metric_scores: dict, state: str | None, version: str | None, generation: int
+) -> list[dict]:
+    # metric_scores, version and generation only key the cache
+    return get_similarity_index().most_similar(zip_code, k=10, state=state)
+
+
+def similar_zips(zip_code: str, scores: dict, state: str | None, within_state: bool) -> list[dict]:
+    """
+    Most similar ZIPs, nationally or within `state`.
+    The upsert runs every time (a no-op when nothing changed); only the
+    search is cached, keyed on the sub-scores so slider weights don't matter.
+    """
+    index = get_similarity_index()
+    index.upsert(zip_code, state, scores)
+    metric_scores = {metric: scores[metric] for metric in METRIC_NAMES if metric in scores}
+    return _most_similar(
+        zip_code, metric_scores, state if within_state else None, index.version, index.generation
+    )
+
+
+@st.cache_data(ttl=_TTL, max_entries=_MAX_ENTRIES, show_spinner=False)
+def score_map_figure(metric: str, state: str | None, version: str | None):
+    return plot_score_map(metric, state)
@@ -1,50 +1,229 @@
 # app/chatbot.py
-from llm.llm_client import get_llm_client
+from dataclasses import dataclass, field
 
+from config.constants import METRIC_NAMES
+from config.settings import settings
+from llm.answer_cache import CachedAnswer, get_answer_cache
+from llm.llm_client import chat_messages, get_llm_client
+from llm.metrics import record_cache_hit
+from llm.narrative_cache import scores_hash
+from llm.providers import estimate_tokens
 
-def _build_prompt(zip_code: str, persona: str, scores: dict, question: str) -> str:
-    overall = scores.get("OverallCivicScore", None)
-    if overall is not None:
-        civic_line = (
-            f"The official Civic Score for ZIP {zip_code} is {overall:.1f} out of 100. "
-            "Always reference this exact value when describing the civic score."
-        )
-    else:
-        civic_line = (
-            f"Civic score for ZIP {zip_code} is unavailable. "
-            "If needed, note that it is unavailable."
-        )
+CHATBOT_SYSTEM_PROMPT = "You are a helpful civic chatbot. Use the provided civic scores verbatim."
 
-    score_lines = "\n".join(f"- {metric}: {value}" for metric, value in scores.items())
+SUMMARY_SYSTEM_PROMPT = (
+    "You compress chat transcripts. Keep facts, user goals and any conclusions; "
+    "drop pleasantries. Answer with the summary only."
+)
+
+
+def _build_context(zip_code: str, persona: str, scores: dict) -> str:
+    """
+    Score context for the ZIP. Identical for every turn about the same ZIP
+    and persona, whatever the slider weights, so providers can reuse the
+    cached prompt prefix. The weighted overall goes in _overall_line.
+    """
+    score_lines = "\n".join(f"- {metric}: {value}" for metric, value in category_scores(scores).items())
 
     return (
         "You are a helpful civic chatbot. "
         "Use the provided civic scores verbatim when referencing them.\n\n"
-        f"{civic_line}\n\n"
         f"Persona: {persona}\n"
         f"ZIP: {zip_code}\n"
         "Score breakdown:\n"
-        f"{score_lines}\n\n"
+        f"{score_lines}"
+    )
+
+
+def _overall_line(zip_code: str, scores: dict) -> str:
+    """
+    The weighted overall score; changes with the sliders, so it follows the prefix.
+    """
+    overall = scores.get("OverallCivicScore", None)
+    if overall is None:
+        return f"Civic score for ZIP {zip_code} is unavailable. If needed, note that it is unavailable."
+    return (
+        f"The official Civic Score for ZIP {zip_code} is {overall:.1f} out of 100. "
+        "Always reference this exact value when describing the civic score."
+    )
+
+
+def category_scores(scores: dict) -> dict:
+    """
+    The eight category scores, without the weight-dependent overall.
+    """
+    return {metric: scores[metric] for metric in METRIC_NAMES if metric in scores}
+
+
+def _build_prompt(zip_code: str, persona: str, scores: dict, question: str) -> str:
+    return (
+        f"{_build_context(zip_code, persona, scores)}\n\n"
+        f"{_overall_line(zip_code, scores)}\n\n"
         f"User question: {question}"
     )
 
 
-def answer_followup(zip_code: str, persona: str, scores: dict, question: str) -> str:
-    model = get_llm_client()
-    base_context = _build_prompt(zip_code, persona, scores, question)
+@dataclass
+class Conversation:
+    """
+    Per-session chat memory for one ZIP and its category scores.
+    Recent turns are kept verbatim; once they exceed CHAT_HISTORY_TOKEN_BUDGET
+    the older ones are folded into a running summary, so prompt size stays
+    bounded however long the conversation gets.
+    """
+    zip_code: str
+    persona: str
+    scores: dict
+    summary: str = ""
+    turns: list[dict] = field(default_factory=list)
+
+    def matches(self, zip_code: str, scores: dict) -> bool:
+        """
+        Same ZIP and category scores. Persona and slider weights may change
+        mid-conversation without wiping its memory (see `update`).
+        """
+        return self.zip_code == zip_code and category_scores(self.scores) == category_scores(scores)
+
+    def update(self, persona: str, scores: dict):
+        self.persona = persona
+        self.scores = scores
+
+    def messages(self, question: str) -> list[dict]:
+        # Stable prefix first; only the tail changes between turns
+        context = _build_context(self.zip_code, self.persona, self.scores)
+        messages = [{"role": "system", "content": f"{CHATBOT_SYSTEM_PROMPT}\n\n{context}"}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+        messages.extend(self.turns)
+        messages.append({"role": "system", "content": _overall_line(self.zip_code, self.scores)})
+        messages.append({"role": "user", "content": question})
+        return messages
+
+    def history_tokens(self) -> int:
+        return sum(estimate_tokens(t["content"]) for t in self.turns)
+
+    def add_turn(self, question: str, answer: str):
+        self.turns.append({"role": "user", "content": question})
+        self.turns.append({"role": "assistant", "content": answer})
+        self.compact()
 
-    if hasattr(model, "generate_content"):
-        resp = model.generate_content(base_context)
-        return resp.text
+    def compact(self):
+        """
+        Summarizes all but the most recent CHAT_KEEP_RECENT_TURNS exchanges
+        when the verbatim history is over budget.
+        """
+        keep = settings.CHAT_KEEP_RECENT_TURNS * 2
+        if self.history_tokens() <= settings.CHAT_HISTORY_TOKEN_BUDGET or len(self.turns) <= keep:
+            return
+
+        split = len(self.turns) - keep
+        old, self.turns = self.turns[:split], self.turns[split:]
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in old)
+        if self.summary:
+            transcript = f"Earlier summary:\n{self.summary}\n\nNew turns:\n{transcript}"
+
+        try:
+            self.summary = get_llm_client().complete(
+                chat_messages(SUMMARY_SYSTEM_PROMPT, transcript), site="chat_summary", persona=self.persona
+            ).text
+        except Exception as e:
+            # Keep the tail of the transcript rather than losing the context
+            print(f"[CHATBOT] WARNING: Summarization failed, truncating history: {e}")
+            self.summary = transcript[-settings.CHAT_HISTORY_TOKEN_BUDGET * 4:]
+
+
+def _answer_context(zip_code: str, persona: str, scores: dict) -> str:
+    # Answers may quote the weighted overall, so it is part of the key
+    return f"{zip_code}|{persona}|{scores_hash(scores)}|{scores.get('OverallCivicScore')}"
+
+
+def _uses_answer_cache(conversation: Conversation | None) -> bool:
+    # Answers that saw earlier turns depend on that history, so they are
+    # neither served from nor stored in the shared cache
+    if not settings.ANSWER_CACHE_ENABLED:
+        return False
+    return conversation is None or not (conversation.turns or conversation.summary)
+
+
+def cached_followup(
+    zip_code: str, persona: str, scores: dict, question: str, conversation: Conversation | None = None
+) -> CachedAnswer | None:
+    """
+    Earlier answer to a near-identical question about the same ZIP, persona and scores.
+    """
+    if not _uses_answer_cache(conversation):
+        return None
+    return get_answer_cache().lookup(_answer_context(zip_code, persona, scores), question)
+
+
+def _remember_answer(zip_code: str, persona: str, scores: dict, question: str, answer: str):
+    get_answer_cache().store(_answer_context(zip_code, persona, scores), question, answer)
+
+
+def _followup_messages(zip_code, persona, scores, question, conversation) -> list[dict]:
+    if conversation is None:
+        return chat_messages(CHATBOT_SYSTEM_PROMPT, _build_prompt(zip_code, persona, scores, question))
+    return conversation.messages(question)
+
+
+def answer_followup(
+    zip_code: str, persona: str, scores: dict, question: str, conversation: Conversation | None = None
+) -> str:
+    """
+    With a conversation the answer sees earlier turns and is added to it.
+    Near-identical repeat questions without earlier turns come from the answer cache.
+    """
+    cacheable = _uses_answer_cache(conversation)
+    hit = cached_followup(zip_code, persona, scores, question, conversation)
+    if hit is not None:
+        record_cache_hit("chatbot", persona)
+        answer = hit.answer
     else:
-        resp = model.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful civic chatbot. Use the provided civic scores verbatim.",
-                },
-                {"role": "user", "content": base_context},
-            ],
-        )
-        return resp.choices[0].message.content
+        messages = _followup_messages(zip_code, persona, scores, question, conversation)
+        answer = get_llm_client().complete(messages, site="chatbot", persona=persona).text
+        if cacheable:
+            _remember_answer(zip_code, persona, scores, question, answer)
+
+    if conversation is not None:
+        conversation.add_turn(question, answer)
+    return answer
+
+
+class FollowupStream:
+    """
+    answer_followup, yielded chunk by chunk as the LLM produces it (for
+    st.write_stream). The answer cache is checked once, up front; `hit` is
+    the CachedAnswer when the answer was served from it.
+    """
+
+    def __init__(self, zip_code: str, persona: str, scores: dict, question: str, conversation: Conversation | None = None):
+        self.zip_code = zip_code
+        self.persona = persona
+        self.scores = scores
+        self.question = question
+        self.conversation = conversation
+        self.cacheable = _uses_answer_cache(conversation)
+        self.hit = cached_followup(zip_code, persona, scores, question, conversation)
+
+    def __iter__(self):
+        if self.hit is not None:
+            record_cache_hit("chatbot", self.persona)
+            chunks = [self.hit.answer]
+            yield self.hit.answer
+        else:
+            chunks = []
+            messages = _followup_messages(self.zip_code, self.persona, self.scores, self.question, self.conversation)
+            for chunk in get_llm_client().stream(messages, site="chatbot", persona=self.persona):
+                chunks.append(chunk)
+                yield chunk
+            if self.cacheable:
+                _remember_answer(self.zip_code, self.persona, self.scores, self.question, "".join(chunks))
+
+        if self.conversation is not None:
+            self.conversation.add_turn(self.question, "".join(chunks))
+
+
+def stream_followup(
+    zip_code: str, persona: str, scores: dict, question: str, conversation: Conversation | None = None
+) -> FollowupStream:
+    return FollowupStream(zip_code, persona, scores, question, conversation)
@@ -0,0 +1,296 @@
+# app/layout.py
+
+import streamlit as st
+
+import re
+
+from app.cache import score_map_figure
+from app.personas import PERSONAS, persona_weights
+from config.settings import settings
+from config.constants import MAX_COMPARE_ZIPS, METRIC_NAMES
+from core.aggregator import SOURCES, collect_many, collect_progressive
+from core.scoring_engine import METRIC_SOURCES, build_raw_frame, compute_scores_batch, get_weights, score_partial
+from core.search import best_zips_near
+from core.snapshot import SCORE_COLUMNS, load_snapshot
+from data_sources.zip_validator import normalize_zip, zip_error
+from llm.metrics import llm_metrics, record_cache_hit
+from llm.narrative_cache import DeadlineNarrative, scores_hash
+from llm.narrative_templates import template_narrative
+from visualizations.comparison_chart import plot_comparison, plot_comparison_bars
+from visualizations.score_cards import render_scorecard
+
+
+def _weight_key(metric: str) -> str:
+    return f"weight_{metric}"
+
+
+def _reset_weights():
+    for metric, value in get_weights().items():
+        st.session_state[_weight_key(metric)] = float(value)
+
+
+def weight_controls() -> dict:
+    """
+    Per-session sliders for the overall-score weights (defaults from settings).
+    Returns the current weights as {metric: weight}.
+    """
+    if any(_weight_key(metric) not in st.session_state for metric in METRIC_NAMES):
+        _reset_weights()
+
+    with st.expander("Score weights", expanded=False):
+        for metric in METRIC_NAMES:
+            st.slider(metric, min_value=0.0, max_value=1.0, step=0.01, key=_weight_key(metric))
+
+        st.button("Reset to defaults", on_click=_reset_weights)
+        st.caption("Weights are relative; the overall score divides by their total.")
+
+    return {metric: float(st.session_state[_weight_key(metric)]) for metric in METRIC_NAMES}
+
+
+def progressive_collect(zip_code: str, weights: dict) -> tuple[dict, list[str]]:
+    """
+    Collects a ZIP's raw data, filling in score cards and raw sections as
+    each source arrives. Placeholders are cleared once everything is in.
+    Returns (raw data, failed sources). Failed sources are left out of the
+    raw data, so their metrics are never scored from empty sections; the
+    partial score cards stay on screen with those metrics marked unavailable.
+    """
+    status, cards, raw = st.empty(), st.empty(), st.empty()
+    data, failed = {}, []
+
+    for source, value, error in collect_progressive(zip_code):
+        if error is None:
+            data[source] = value
+        else:
+            failed.append(source)
+
+        status.caption(f"⏳ Loaded {len(data) + len(failed)} of {len(SOURCES)} data sources for ZIP {zip_code}...")
+        scores, pending = score_partial(data, weights)
+        with cards.container():
+            render_scorecard(scores, data, zip_code, pending=pending)
+        with raw.container():
+            with st.expander(f"Raw data so far ({', '.join(data)})", expanded=False):
+                st.json(data)
+
+    status.empty()
+    raw.empty()
+    if not failed:
+        cards.empty()
+        return data, failed
+
+    cards.empty()
+    unavailable = [m for m, sources in METRIC_SOURCES.items() if any(src in failed for src in sources)]
+    scores, pending = score_partial(data, weights)
+    with cards.container():
+        render_scorecard(scores, data, zip_code, pending=pending, unavailable=unavailable)
+    st.warning(
+        f"Some data sources failed: {', '.join(failed)}. Their metrics are left out "
+        "and this partial result is not saved. Try analyzing the ZIP again later."
+    )
+    return data, failed
+
+
+def near_me_panel(persona: str, base_weights: dict):
+    """
+    "Best ZIPs near me": top-K cached ZIPs for the persona within a radius.
+    """
+    with st.expander("📍 Best ZIPs near me", expanded=False):
+        c1, c2, c3 = st.columns(3)
+        center = c1.text_input("Center ZIP", key="near_center")
+        radius = c2.slider("Radius (miles)", 1, 100, 10, key="near_radius")
+        k = c3.number_input("Results", 1, 50, 10, key="near_k")
+
+        f1, f2, f3 = st.columns(3)
+        filter_metric = f1.selectbox("Filter metric", ["(none)"] + METRIC_NAMES, key="near_filter_metric")
+        filter_op = f2.selectbox("Condition", [">", ">=", "<", "<="], key="near_filter_op")
+        filter_value = f3.number_input("Value", 0.0, 100.0, 60.0, key="near_filter_value")
+
+        if not center.strip():
+            st.caption("Enter a ZIP to search around it.")
+            return
+
+        center = normalize_zip(center)
+        error = zip_error(center)
+        if error:
+            st.error(error)
+            return
+
+        filters = None
+        if filter_metric != "(none)":
+            filters = [(filter_metric, filter_op, filter_value)]
+
+        try:
+            results = best_zips_near(
+                center, radius, persona_weights(persona, base_weights), k=int(k), filters=filters
+            )
+        except ValueError as e:
+            st.error(str(e))
+            return
+        if not results:
+            st.info("No cached ZIPs match. Build the snapshot with scripts/build_snapshot.py.")
+            return
+
+        st.caption(f"Ranked by the {persona} score")
+        st.dataframe(results, hide_index=True)
+
+
+def _comparison_charts(scores, key: str):
+    left, right = st.columns(2)
+    left.plotly_chart(plot_comparison(scores), use_container_width=True, key=f"compare_radial_{key}")
+    right.plotly_chart(plot_comparison_bars(scores), use_container_width=True, key=f"compare_bars_{key}")
+
+
+def comparison_panel(base_weights: dict):
+    """
+    Side-by-side comparison of up to MAX_COMPARE_ZIPS ZIPs.
+    Uncached ZIPs are fetched concurrently; charts refresh as each one lands.
+    The fetched ZIPs are kept in session state so the comparison survives reruns.
+    """
+    with st.expander("⚖️ Compare ZIPs", expanded=False):
+        text = st.text_input(f"ZIPs to compare (up to {MAX_COMPARE_ZIPS}, comma separated)", key="compare_zips")
+        if not st.button("Compare", key="compare_run"):
+            # Rescored on every rerun so weight changes apply to the saved ZIPs
+            saved = st.session_state.get("comparison")
+            if saved:
+                scores = compute_scores_batch(build_raw_frame(saved), base_weights).loc[list(saved)]
+                st.caption(f"Comparing {', '.join(saved)}")
+                _comparison_charts(scores, "saved")
+                st.dataframe(scores.T, use_container_width=True)
+            return
+
+        st.session_state.comparison = None
+
+        zips = list(dict.fromkeys(z for z in re.split(r"[\s,;]+", text) if z))
+        invalid = {z: zip_error(z) for z in zips if zip_error(z)}
+        for error in invalid.values():
+            st.warning(f"Skipped: {error}")
+        zips = [z for z in zips if z not in invalid][:MAX_COMPARE_ZIPS]
+        if len(zips) < 2:
+            st.info("Enter at least two valid ZIP codes.")
+            return
+
+        status = st.empty()
+        charts = st.empty()
+        table = st.empty()
+
+        ready = {}
+        for zip_code, data, error in collect_many(zips):
+            if error is not None:
+                st.warning(f"ZIP {zip_code} failed: {error}")
+                continue
+            ready[zip_code] = data
+
+            # Rescore everything that is ready in one vectorized batch
+            scores = compute_scores_batch(build_raw_frame(ready), base_weights)
+            scores = scores.loc[[z for z in zips if z in ready]]
+
+            status.caption(f"Loaded {len(ready)} of {len(zips)} ZIPs")
+            with charts.container():
+                # Keyed per refresh: each pass replaces the previous charts
+                _comparison_charts(scores, str(len(ready)))
+            table.dataframe(scores.T, use_container_width=True)
+
+        if len(ready) >= 2:
+            st.session_state.comparison = {z: ready[z] for z in zips if z in ready}
+
+
+def score_map_panel():
+    """
+    National or state map of cached ZIPs colored by any score column.
+    """
+    with st.expander("🗺️ Score map", expanded=False):
+        snapshot = load_snapshot()
+        if snapshot is None:
+            st.info("No score snapshot yet. Build it with scripts/build_snapshot.py.")
+            return
+
+        states = sorted(s for s in set(snapshot.states.tolist()) if s)
+        c1, c2 = st.columns(2)
+        scope = c1.selectbox("Scope", ["National"] + states, key="map_scope")
+        metric = c2.selectbox("Color by", SCORE_COLUMNS, index=len(SCORE_COLUMNS) - 1, key="map_metric")
+
+        fig = score_map_figure(metric, None if scope == "National" else scope, snapshot.version)
+        if fig is None:
+            st.caption("No cached ZIPs for this selection.")
+            return
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment(run_every=settings.NARRATIVE_POLL_SECONDS)
+def _await_narrative(view: tuple):
+    """
+    Polls the background LLM narrative for `view`; once it lands (and is
+    cached) the page reruns so the slot shows it instead of the template.
+    """
+    pending = st.session_state.get("pending_narrative")
+    if pending is None or pending[0] != view:
+        return
+
+    future = pending[1]
+    if not future.done():
+        st.caption("⏳ Showing a quick summary while the full narrative is generated...")
+        return
+
+    del st.session_state["pending_narrative"]
+    if future.exception() is not None:
+        print(f"[NARRATIVE] WARNING: Background narrative failed for {view[0]}: {future.exception()}")
+        return
+    st.rerun()
+
+
+def narrative_panel(zip_code: str, scores: dict, persona: str):
+    """
+    Cached by (zip, persona, scores, model, prompt version): reruns are instant.
+    On a miss the text streams in as it is generated; if the LLM is slower
+    than NARRATIVE_DEADLINE_SECONDS a template narrative is shown and swapped
+    for the LLM text when it arrives, without blocking the rest of the page.
+    """
+    view = (zip_code, persona, scores_hash(scores))
+
+    # Still generating from an earlier run: keep the template, don't ask again
+    pending = st.session_state.get("pending_narrative")
+    if pending is not None and pending[0] == view and not pending[1].done():
+        st.markdown(template_narrative(zip_code, scores, persona))
+        _await_narrative(view)
+        return
+
+    narrative = DeadlineNarrative(
+        zip_code, scores, persona, personas=PERSONAS if settings.NARRATIVE_MULTI_PERSONA else None
+    )
+    st.write_stream(narrative)
+
+    # One hit per view, not per rerun; the view that generated the text
+    # (or is still generating it) doesn't count its own cached copy
+    if narrative.from_cache and st.session_state.get("narrative_view") != view:
+        record_cache_hit("narrative", persona)
+    st.session_state.narrative_view = view
+
+    if narrative.pending is not None:
+        st.session_state.pending_narrative = (view, narrative.pending)
+        _await_narrative(view)
+
+
+def llm_usage_panel():
+    """
+    LLM latency, token and cost figures recorded in this process.
+    """
+    with st.expander("📈 LLM usage", expanded=False):
+        by_site = llm_metrics.summary(("site",))
+        if not by_site:
+            st.caption("No LLM calls yet.")
+            return
+
+        st.markdown("**By feature**")
+        st.dataframe(by_site, hide_index=True, use_container_width=True)
+        st.markdown("**Daily spend**")
+        st.dataframe(llm_metrics.daily_spend(), hide_index=True, use_container_width=True)
+
+        group = st.selectbox("Break down by", ["persona", "model"], key="llm_usage_group")
+        st.dataframe(llm_metrics.summary(("site", group)), hide_index=True, use_container_width=True)
+
+        st.download_button(
+            "Download JSON log",
+            llm_metrics.export_json(),
+            file_name="llm_calls.json",
+            mime="application/json",
+        )
@@ -9,16 +9,26 @@ sys.path.insert(0, ROOT)
 import streamlit as st
 
 from config.settings import settings
-from data_sources.zip_validator import is_valid_us_zip, normalize_zip
-from core.aggregator import collect_all_data
-from core.scoring_engine import compute_scores
+from data_sources.zip_validator import looks_like_zip, normalize_zip, zip_error
+from data_sources.place_index import resolve_place
+from core.scoring_engine import score_zip
+from core.percentiles import percentile_ranks
+from data_sources.uszips import zip_state
 #from visualizations.radar_chart import plot_radar
-from visualizations.radial_chart import plot_radial
 from visualizations.score_cards import render_scorecard
-from visualizations.map_view import make_map_df
-from llm.narrative_generator import generate_narrative
-from app.personas import PERSONAS, default_persona
-from app.chatbot import answer_followup
+from visualizations.map_view import clicked_zip
+from app.cache import cached_zip_data, click_map, radial_figure, remember_zip_data, similar_zips, zip_data
+from app.personas import PERSONAS, default_persona, persona_scores
+from app.layout import (
+    comparison_panel,
+    llm_usage_panel,
+    narrative_panel,
+    near_me_panel,
+    progressive_collect,
+    score_map_panel,
+    weight_controls,
+)
+from app.chatbot import Conversation, stream_followup
 
 
 def main():
@@ -29,18 +39,31 @@ def main():
     # Initialize session state the first time the app loads
     if "raw_data" not in st.session_state:
         st.session_state.raw_data = None
-        st.session_state.scores = None
-        st.session_state.computed_scores = None
         st.session_state.selected_zip = None
         st.session_state.selected_persona = default_persona()
 
     with st.sidebar:
         st.header("Input ZIP")
-        zip_code_input = st.text_input("ZIP Code (US)", value=st.session_state.selected_zip)
+        zip_code_input = st.text_input("ZIP code or place (US)", value=st.session_state.selected_zip)
+
+        # Free text ("Hoboken NJ") resolves to ranked ZIP candidates
+        if zip_code_input and not looks_like_zip(zip_code_input):
+            candidates = resolve_place(zip_code_input)
+            if candidates:
+                choice = st.selectbox(
+                    "Matching ZIPs",
+                    candidates,
+                    format_func=lambda c: f"{c['zip']} · {c['city']}, {c['state']} ({c['county']} County)",
+                )
+                zip_code_input = choice["zip"]
+            else:
+                st.caption("No matching places found.")
         persona = st.selectbox("Persona", PERSONAS, index=PERSONAS.index(st.session_state.selected_persona))
 
         run = st.button("Analyze ZIP")
 
+        weights = weight_controls()
+
         st.markdown("---")
         st.caption(
             f"Mode: {'Mock data' if settings.USE_MOCK_DATA else 'Live APIs'} · "
@@ -52,25 +75,39 @@ def main():
 
     if run:
         normalized_zip = normalize_zip(zip_code_input)
-        if not is_valid_us_zip(normalized_zip):
-            st.error("Please enter a valid 5-digit US ZIP code.")
+        error = zip_error(normalized_zip)
+        if error:
+            st.error(error)
             st.stop()
 
-        with st.spinner("Collecting data sources and computing scores..."):
-            raw_data = collect_all_data(normalized_zip)
-            scores = compute_scores(raw_data)
+        # Recently viewed ZIPs come straight from the shared cache; otherwise
+        # score cards fill in per source instead of one spinner for all seven
+        raw_data = cached_zip_data(normalized_zip)
+        if raw_data is None:
+            raw_data, failed = progressive_collect(normalized_zip, weights)
+            if failed:
+                # Partial data is shown but never scored as complete, cached or
+                # fed to the narrative, similarity index or chat
+                st.session_state.raw_data = None
+                st.stop()
+            remember_zip_data(normalized_zip, raw_data)
 
         st.session_state.raw_data = raw_data
-        st.session_state.scores = scores
-        st.session_state.computed_scores = scores  # default until UI recalculates
         st.session_state.selected_zip = normalized_zip
 
-    if st.session_state.raw_data is None or st.session_state.scores is None:
+    near_me_panel(persona, weights)
+    comparison_panel(weights)
+    score_map_panel()
+    llm_usage_panel()
+
+    if st.session_state.raw_data is None:
         st.info("Enter a ZIP and click **Analyze ZIP** to start.")
         return
 
     raw_data = st.session_state.raw_data
-    scores = st.session_state.scores
+    # Memoized: every rerun and every component below shares this result object.
+    # A weight change only recomputes the overall score from the cached metrics.
+    scores = score_zip(raw_data, weights)
     zip_code = st.session_state.selected_zip
     persona = st.session_state.selected_persona
 
@@ -85,44 +122,89 @@ def main():
     with col1:
         st.subheader(" Scorecards")
 
-        # Use the scorecard component that computes and displays dynamic values
-        computed_scores = render_scorecard(scores, raw_data, zip_code)
-        st.session_state.computed_scores = computed_scores
+        # "Top X%" ranks from the national snapshot (binary search per metric);
+        # the overall is ranked only under the snapshot's default weights
+        state = zip_state(zip_code)
+        ranks = percentile_ranks(scores, state, weights)
+        render_scorecard(scores, raw_data, zip_code, ranks=ranks, state=state)
+
+        # Every persona's overall score from the same metric vector (one matrix product)
+        all_persona_scores = persona_scores(scores, weights)
+        st.metric(f"{persona} Score", f"{all_persona_scores[persona]:.1f} / 100")
+        with st.expander("Scores by persona", expanded=False):
+            st.dataframe(
+                {"Persona": list(all_persona_scores), "Score": list(all_persona_scores.values())},
+                hide_index=True,
+            )
 
         # Extract metric scores for the radial chart (exclude overall)
-        metric_scores_for_chart = {k: v for k, v in computed_scores.items() if k != "OverallCivicScore"}
+        metric_scores_for_chart = {k: v for k, v in scores.items() if k != "OverallCivicScore"}
 
-        fig = plot_radial(metric_scores_for_chart)
+        fig = radial_figure(metric_scores_for_chart)
         st.plotly_chart(fig, use_container_width=True)
 
+        with st.expander("🔁 Similar ZIPs", expanded=False):
+            within_state = st.radio("Scope", ["Nationwide", f"Within {state or 'state'}"], horizontal=True) != "Nationwide"
+            similar = similar_zips(zip_code, scores, state, within_state)
+            if similar:
+                st.dataframe(similar, hide_index=True)
+            else:
+                st.caption("No other scored ZIPs yet. Build the snapshot with scripts/build_snapshot.py.")
+
     with col2:
         st.subheader("🗺️ Location")
-        map_df = make_map_df(zip_code)
-        st.map(map_df, zoom=11)
+        selection = st.pydeck_chart(click_map(zip_code), on_select="rerun", key=f"zip_map_{zip_code}")
+        st.caption("Click a nearby area to analyze it.")
 
-    st.markdown("---")
+        # Map click → nearest ZIP (in-memory centroid index) → new analysis
+        picked_zip = clicked_zip(selection)
+        if picked_zip and picked_zip != zip_code:
+            with st.spinner(f"Collecting data for ZIP {picked_zip}..."):
+                st.session_state.raw_data = zip_data(picked_zip)
+            st.session_state.selected_zip = picked_zip
+            st.rerun()
 
-    with st.spinner("Generating narrative and recommendations..."):
-        narrative = generate_narrative(zip_code, scores, persona)
+    st.markdown("---")
 
     st.subheader("🧠 Narrative & Recommendations")
-    st.markdown(narrative)
+    narrative_panel(zip_code, scores, persona)
 
     st.markdown("---")
     st.subheader("💬 Chatbot")
+
+    # One conversation per ZIP and category scores; a new analysis starts fresh,
+    # a persona or weight change keeps the memory
+    conversation = st.session_state.get("conversation")
+    if conversation is None or not conversation.matches(zip_code, scores):
+        conversation = st.session_state.conversation = Conversation(zip_code, persona, scores)
+    conversation.update(persona, scores)
+
+    if conversation.summary:
+        st.caption("Earlier messages have been summarized to keep answers fast.")
+    for turn in conversation.turns:
+        with st.chat_message(turn["role"]):
+            st.markdown(turn["content"])
+
     followup = st.text_area(
         "Ask a follow-up question about this ZIP:",
         placeholder="e.g., How suitable is this area for a tech startup?",
     )
-    if st.button("Send Question"):
+    ask_col, clear_col = st.columns([1, 1])
+    if ask_col.button("Send Question"):
         if followup.strip():
-            with st.spinner("Thinking..."):
-                latest_scores = st.session_state.get("computed_scores") or scores
-                reply = answer_followup(zip_code, persona, latest_scores, followup.strip())
-            st.markdown("**Chatbot:**")
-            st.markdown(reply)
+            with st.chat_message("user"):
+                st.markdown(followup.strip())
+            with st.chat_message("assistant"):
+                answer = stream_followup(zip_code, persona, scores, followup.strip(), conversation)
+                st.write_stream(answer)
+                if answer.hit is not None:
+                    hit = answer.hit
+                    st.caption(f"⚡ Cached answer to a similar question: “{hit.question}” ({hit.similarity:.0f}% match)")
         else:
             st.warning("Please type a question first.")
+    if clear_col.button("Clear conversation"):
+        st.session_state.conversation = Conversation(zip_code, persona, scores)
+        st.rerun()
 
 
 if __name__ == "__main__":
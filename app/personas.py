@@ -1,5 +1,7 @@
 # app/personas.py
 
+from core.scoring_engine import compute_overall_matrix, get_weights, metric_vector, weight_matrix
+
 PERSONAS = [
     "General",
     "Family",
@@ -8,6 +10,72 @@ PERSONAS = [
     "NGO",
 ]
 
+# Overall-score weights per persona (relative; divided by their total).
+# "General" uses the base weights (settings or the sidebar sliders).
+PERSONA_WEIGHTS = {
+    "General": None,
+    "Family": {
+        "Safety": 0.25,
+        "Health": 0.15,
+        "Education": 0.22,
+        "EconomicOpportunity": 0.05,
+        "HousingAffordability": 0.15,
+        "DigitalAccess": 0.05,
+        "Environment": 0.08,
+        "Accessibility": 0.05,
+    },
+    "Business": {
+        "Safety": 0.10,
+        "Health": 0.05,
+        "Education": 0.15,
+        "EconomicOpportunity": 0.30,
+        "HousingAffordability": 0.05,
+        "DigitalAccess": 0.20,
+        "Environment": 0.03,
+        "Accessibility": 0.12,
+    },
+    "Government Planner": {
+        "Safety": 0.15,
+        "Health": 0.15,
+        "Education": 0.12,
+        "EconomicOpportunity": 0.12,
+        "HousingAffordability": 0.16,
+        "DigitalAccess": 0.10,
+        "Environment": 0.10,
+        "Accessibility": 0.10,
+    },
+    "NGO": {
+        "Safety": 0.12,
+        "Health": 0.22,
+        "Education": 0.12,
+        "EconomicOpportunity": 0.10,
+        "HousingAffordability": 0.22,
+        "DigitalAccess": 0.10,
+        "Environment": 0.07,
+        "Accessibility": 0.05,
+    },
+}
+
 
 def default_persona() -> str:
     return "General"
+
+
+def persona_weights(persona: str, base_weights: dict | None = None) -> dict:
+    return PERSONA_WEIGHTS.get(persona) or base_weights or get_weights()
+
+
+def persona_weight_matrix(base_weights: dict | None = None):
+    """
+    (personas x metrics) weight matrix, rows in PERSONAS order.
+    """
+    return weight_matrix([persona_weights(p, base_weights) for p in PERSONAS])
+
+
+def persona_scores(scores: dict, base_weights: dict | None = None) -> dict:
+    """
+    Overall score for every persona from one ZIP's metric scores.
+    """
+    values = compute_overall_matrix(metric_vector(scores), persona_weight_matrix(base_weights))
+    return dict(zip(PERSONAS, values.tolist()))
+
@@ -8,6 +8,7 @@ METRIC_NAMES = [
     "HousingAffordability",
     "DigitalAccess",
     "Environment",
+    "Accessibility",
 ]
 
 # Min/max for normalization (you can tune when you plug real APIs)
@@ -20,3 +21,21 @@ NORMALIZATION_BOUNDS = {
     "broadband_pct": (40.0, 100.0),
     "rent_to_income": (0.1, 0.6),          # lower is better
 }
+
+# Bump whenever NORMALIZATION_BOUNDS (or the scoring math) changes so
+# memoized scores computed with the old bounds are not reused.
+NORMALIZATION_BOUNDS_VERSION = 1
+
+# Maximum number of ZIPs in the side-by-side comparison view
+MAX_COMPARE_ZIPS = 6
+
+# LLM list prices, USD per 1M tokens: (prompt, completion).
+# Used for cost reports only; update when provider pricing changes.
+MODEL_PRICES = {
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "stub-1": (0.0, 0.0),
+}
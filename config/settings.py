@@ -5,7 +5,11 @@ from pydantic_settings import BaseSettings
 
 # Path to.env file (located in project root)
 
-ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ENV_PATH = PROJECT_ROOT / ".env"
+
+# Generated artifacts (ZIP tables, score snapshots, indexes); not committed
+DATA_DIR = PROJECT_ROOT / "data"
 
 
 
@@ -13,7 +17,10 @@ ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
 
 class Settings(BaseSettings):
     # ---------- LLM Provider ----------
-    LLM_PROVIDER: str = "openai"
+    LLM_PROVIDER: str = "openai"             # openai | gemini | stub
+    LLM_FALLBACK_PROVIDER: str | None = None # tried when the primary errors or times out
+    LLM_TIMEOUT_SECONDS: float = 30.0        # per-call deadline
+    LLM_STUB_LATENCY: float = 0.0            # simulated latency for the stub provider
     
     # --------- API Keys ---------
     OPENAI_API_KEY: str | None = None
@@ -29,6 +36,32 @@ class Settings(BaseSettings):
 
     # --------- LLM Model ---------
     OPENAI_MODEL: str = "gpt-4.1-mini"
+    GEMINI_MODEL: str = "gemini-1.5-flash"
+
+    # --------- LLM Caching ---------
+    NARRATIVE_CACHE_SIZE: int = 512          # in-process LRU entries
+    NARRATIVE_DEADLINE_SECONDS: float = 6.0  # show the template narrative after this
+    NARRATIVE_POLL_SECONDS: float = 1.0      # how often the page checks for the LLM text behind a template
+    NARRATIVE_MULTI_PERSONA: bool = False    # one request writes every persona's narrative
+
+    # --------- Chatbot Memory ---------
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1500    # verbatim history kept before summarizing
+    CHAT_KEEP_RECENT_TURNS: int = 2          # exchanges never summarized
+
+    # --------- Chatbot Answer Cache ---------
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_THRESHOLD: float = 85.0     # 0-100 similarity needed to reuse an answer
+    ANSWER_CACHE_MAX_CONTEXTS: int = 256     # (zip, persona, scores) groups kept, LRU
+    ANSWER_CACHE_MAX_PER_CONTEXT: int = 20   # newest questions kept per group
+    ANSWER_CACHE_TTL_SECONDS: int = 86400
+
+    # --------- LLM Metrics ---------
+    LLM_METRICS_MAX_RECORDS: int = 10000     # recent calls kept in memory
+    LLM_METRICS_LOG: bool = False            # append every call to data/llm_calls.jsonl
+
+    # --------- Streamlit Caching ---------
+    STREAMLIT_CACHE_TTL_SECONDS: int = 3600  # data, figures and maps shared across sessions
+    STREAMLIT_CACHE_MAX_ENTRIES: int = 500   # per cached function
 
     # --------- MODE ---------
     USE_MOCK_DATA: bool = False
@@ -1,5 +1,7 @@
 # core/aggregator.py
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from data_sources.census_api import fetch_census_data
 from data_sources.health_api import fetch_health_data
 from data_sources.crime_api import fetch_crime_data
@@ -8,53 +10,113 @@ from data_sources.housing_api import fetch_housing_data
 from data_sources.broadband_api import fetch_broadband_data
 from data_sources.air_quality_api import fetch_air_quality_data
 
+from data_sources.zip_validator import to_zcta, zip_error
 from db.zip_cache import get_cached_zip, store_zip_data
 
 
-def collect_all_data(zip_code: str) -> dict:
+# Raw-data sections in the order they are stored
+SOURCES = ["census", "health", "crime", "osm", "housing", "broadband", "air_quality"]
+
+
+def _source_calls(zip_code: str) -> dict:
+    # Census-based sources only know ZCTAs, so PO-box ZIPs use their crosswalk ZCTA
+    zcta = to_zcta(zip_code)
+
+    return {
+        "census": (fetch_census_data, zcta),
+        "health": (fetch_health_data, zip_code),
+        "crime": (fetch_crime_data, zcta),
+        "osm": (fetch_osm_poi_data, zcta),
+        "housing": (fetch_housing_data, zcta),
+        "broadband": (fetch_broadband_data, zcta),
+        "air_quality": (fetch_air_quality_data, zip_code),
+    }
+
+
+def collect_progressive(zip_code: str):
     """
-    Unified data collector with Supabase caching.
-    Steps:
-      1) Check cache first.
-      2) If cached → return quickly.
-      3) If not → fetch each data source live.
-      4) Store result into Supabase.
-      5) Return final aggregated dataset.
+    Same data as collect_all_data, yielded per source as it arrives.
+    Yields (source, data, error); all sources run concurrently, so a slow
+    Overpass or HRSA call does not hold back the Census-based sections.
+    Cached ZIPs yield every source at once. The full result is stored in
+    Supabase only if every source succeeded.
     """
+    error = zip_error(zip_code)
+    if error:
+        raise ValueError(error)
 
-   
-    # STEP 1: Try Cache First 
-   
     cached = get_cached_zip(zip_code)
     if cached:
         print(f"[CACHE] Returning cached data for ZIP {zip_code}")
-        return cached
+        for source in SOURCES:
+            if source in cached:
+                yield source, cached[source], None
+        return
 
- 
-    # STEP 2: Fetch Live Data 
- 
     print(f"[LIVE] Fetching fresh data for ZIP {zip_code}")
 
-    live_data = {
-        "census": fetch_census_data(zip_code),
-        "health": fetch_health_data(zip_code),
-        "crime": fetch_crime_data(zip_code),
-        "osm": fetch_osm_poi_data(zip_code),
-        "housing": fetch_housing_data(zip_code),
-        "broadband": fetch_broadband_data(zip_code),
-        "air_quality": fetch_air_quality_data(zip_code),
-    }
+    live_data, failed = {}, False
+    with ThreadPoolExecutor(max_workers=len(SOURCES)) as pool:
+        futures = {pool.submit(fn, arg): source for source, (fn, arg) in _source_calls(zip_code).items()}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                live_data[source] = future.result()
+            except Exception as e:
+                failed = True
+                print(f"[LIVE] WARNING: {source} failed for ZIP {zip_code}: {e}")
+                yield source, None, e
+                continue
+            yield source, live_data[source], None
 
-  
-    # STEP 3: Store into Supabase 
+    if failed:
+        return
 
     try:
-        store_zip_data(zip_code, live_data)
+        store_zip_data(zip_code, {source: live_data[source] for source in SOURCES})
         print(f"[CACHE] Stored ZIP {zip_code} data in Supabase")
     except Exception as e:
         print(f"[CACHE] WARNING: Failed to cache ZIP {zip_code}: {e}")
 
-    
-    # STEP 4: Return Live Output
-   
-    return live_data
+
+def collect_all_data(zip_code: str) -> dict:
+    """
+    Unified data collector with Supabase caching.
+    Steps:
+      0) Reject ZIPs that do not exist (no network calls).
+      1) Check cache first.
+      2) If cached → return quickly.
+      3) If not → fetch every data source live (concurrently).
+      4) Store result into Supabase.
+      5) Return final aggregated dataset.
+    Raises the first source error, like the sequential version did.
+    """
+    data = {}
+    for source, value, error in collect_progressive(zip_code):
+        if error is not None:
+            raise error
+        data[source] = value
+
+    return {source: data[source] for source in SOURCES if source in data}
+
+
+def collect_many(zip_codes: list[str], max_workers: int = 4):
+    """
+    Collects several ZIPs concurrently.
+    Yields (zip_code, data, error) as each ZIP finishes, so callers can
+    render the first results while the rest are still loading.
+    Upstream calls shared between sources (Census, OSM) are deduplicated.
+    """
+    zip_codes = list(dict.fromkeys(zip_codes))
+    if not zip_codes:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(zip_codes))) as pool:
+        futures = {pool.submit(collect_all_data, z): z for z in zip_codes}
+        for future in as_completed(futures):
+            zip_code = futures[future]
+            try:
+                yield zip_code, future.result(), None
+            except Exception as e:
+                print(f"[LIVE] WARNING: Failed to collect ZIP {zip_code}: {e}")
+                yield zip_code, None, e
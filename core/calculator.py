@@ -1,5 +1,7 @@
 # core/calculator.py
 
+import numpy as np
+
 def _normalize(value, vmin=0, vmax=100, invert=False):
     """
     Fully safe normalization.
@@ -42,3 +44,22 @@ def _normalize(value, vmin=0, vmax=100, invert=False):
 
     #Scale to 0–100
     return score * 100
+
+
+def _normalize_array(values, vmin=0, vmax=100, invert=False):
+    """
+    Vectorized version of _normalize for float arrays.
+    Uses the same clamp / scale steps so results match element by element.
+    """
+    values = np.asarray(values, dtype=float)
+
+    if vmax == vmin:
+        return np.full(values.shape, 50.0)
+
+    value_clamped = np.maximum(np.minimum(values, float(vmax)), float(vmin))
+    score = (value_clamped - vmin) / (vmax - vmin)
+
+    if invert:
+        score = 1 - score
+
+    return score * 100
@@ -1,22 +1,39 @@
+# core/geo_utils.py
 
+import functools
+import math
 
+import numpy as np
 import pgeocode
 
-# Initialize US geocoder once (fast)
-nomi = pgeocode.Nominatim("us")
+from data_sources.uszips import load_uszips
+from data_sources.zip_validator import normalize_zip, to_zcta, zip_error
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+@functools.lru_cache(maxsize=1)
+def _nominatim():
+    # pgeocode downloads its dataset on first use, so only build it if needed
+    return pgeocode.Nominatim("us")
 
 
 def zip_to_latlon(zip_code: str) -> tuple[float, float]:
     """
-    Converts a ZIP Code to (latitude, longitude) using pgeocode.
+    Converts a ZIP Code to (latitude, longitude).
+    Uses the bundled uszips centroids, then pgeocode for ZIPs missing there.
     Returns a tuple (lat, lon). If ZIP not found → fallback coordinates.
 
     Example:
         zip_to_latlon("07306") -> (40.733, -74.065)
     """
+    row = _zip_rows().get(zip_code)
+    if row is not None:
+        df = load_uszips()
+        return float(df["lat"].iat[row]), float(df["lng"].iat[row])
 
     try:
-        info = nomi.query_postal_code(zip_code)
+        info = _nominatim().query_postal_code(zip_code)
 
         # pgeocode returns a Pandas Series with fields:
         # latitude, longitude, place_name, state_name, county_name
@@ -24,7 +41,7 @@ def zip_to_latlon(zip_code: str) -> tuple[float, float]:
         lat = float(info.latitude) if info.latitude is not None else None
         lon = float(info.longitude) if info.longitude is not None else None
 
-        if lat is None or lon is None:
+        if lat is None or lon is None or math.isnan(lat) or math.isnan(lon):
             raise ValueError("Invalid coordinates from pgeocode")
 
         return lat, lon
@@ -34,3 +51,169 @@ def zip_to_latlon(zip_code: str) -> tuple[float, float]:
 
         # Fallback to NYC (safe default)
         return 40.7128, -74.0060
+
+
+# =============================================================================
+# CENTROID SPATIAL INDEX (bundled uszips table)
+# =============================================================================
+
+def _to_unit_xyz(lat, lon) -> np.ndarray:
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def _chord(distance_km: float) -> float:
+    """Straight-line distance on the unit sphere for a great-circle distance."""
+    return 2 * math.sin(min(distance_km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class CentroidIndex:
+    """
+    Uniform grid over unit-sphere (x, y, z) coordinates of ZIP centroids.
+    Queries only visit the cells around the point and then measure exact
+    great-circle distances for those candidates.
+    """
+
+    def __init__(self, lat, lon, cell_km: float = 25.0):
+        self.xyz = _to_unit_xyz(lat, lon)
+        self.cell = cell_km / EARTH_RADIUS_KM
+
+        keys = np.floor(self.xyz / self.cell).astype(np.int64)
+        order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+        bounds = np.concatenate([[0], starts, [len(order)]])
+
+        self.cells = {
+            tuple(sorted_keys[bounds[i]].tolist()): order[bounds[i]:bounds[i + 1]]
+            for i in range(len(bounds) - 1)
+        }
+
+    def _candidates(self, point: np.ndarray, reach: int) -> np.ndarray:
+        """
+        Rows in the cube of cells within `reach` cells of the point.
+        Any row outside it is more than reach * cell away (chord distance).
+        """
+        if (2 * reach + 1) ** 3 >= len(self.cells):
+            # Visiting that many cells costs more than measuring everything
+            return np.arange(len(self.xyz))
+
+        cx, cy, cz = np.floor(point / self.cell).astype(np.int64).tolist()
+        parts = []
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                for dz in range(-reach, reach + 1):
+                    cell_rows = self.cells.get((cx + dx, cy + dy, cz + dz))
+                    if cell_rows is not None:
+                        parts.append(cell_rows)
+
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    def query_radius(self, lat: float, lon: float, radius_km: float):
+        """
+        Rows within radius_km of (lat, lon) and their distances in km, nearest first.
+        """
+        point = _to_unit_xyz(lat, lon)
+        rows = self._candidates(point, int(math.ceil(_chord(radius_km) / self.cell)))
+
+        dist = self._distance_km(point, rows)
+        keep = dist <= radius_km
+        rows, dist = rows[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return rows[order], dist[order]
+
+    def query_nearest(self, lat: float, lon: float, k: int = 1):
+        """
+        The k rows nearest to (lat, lon) and their distances in km, nearest first.
+        Grows the searched cube until k candidates are provably the closest.
+        """
+        k = min(k, len(self.xyz))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        point = _to_unit_xyz(lat, lon)
+        reach = 1
+        while True:
+            rows = self._candidates(point, reach)
+            dist = self._distance_km(point, rows)
+            exhaustive = len(rows) == len(self.xyz)
+
+            if len(rows) >= k:
+                nearest = np.argpartition(dist, k - 1)[:k]
+                nearest = nearest[np.argsort(dist[nearest], kind="stable")]
+                # Rows outside the cube are farther than reach * cell (chord)
+                if exhaustive or _chord(dist[nearest[-1]]) <= reach * self.cell:
+                    return rows[nearest], dist[nearest]
+
+            reach *= 2
+
+    def _distance_km(self, point: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        cos_angle = np.clip(self.xyz[rows] @ point, -1.0, 1.0)
+        return np.arccos(cos_angle) * EARTH_RADIUS_KM
+
+
+@functools.lru_cache(maxsize=1)
+def centroid_index() -> CentroidIndex:
+    """
+    Index over the uszips table; row i is load_uszips().iloc[i].
+    """
+    df = load_uszips()
+    return CentroidIndex(df["lat"].to_numpy(), df["lng"].to_numpy())
+
+
+@functools.lru_cache(maxsize=1)
+def _zip_rows() -> dict:
+    return {z: i for i, z in enumerate(load_uszips()["zip"].tolist())}
+
+
+@functools.lru_cache(maxsize=1)
+def _zip_array() -> np.ndarray:
+    return load_uszips()["zip"].to_numpy(dtype=str)
+
+
+def resolve_point(zip_or_point) -> tuple[float, float]:
+    """
+    Accepts a ZIP string or a (lat, lon) pair.
+    ZIPs without a centroid of their own (PO boxes, unique ZIPs) use their
+    crosswalk ZCTA's. Raises ValueError for ZIPs that cannot be analyzed
+    (zip_error) or have no centroid; never falls back to a fixed point.
+    """
+    if not isinstance(zip_or_point, str):
+        lat, lon = zip_or_point
+        return float(lat), float(lon)
+
+    zip_code = normalize_zip(zip_or_point)
+    error = zip_error(zip_code)
+    if error:
+        raise ValueError(error)
+
+    row = _zip_rows().get(to_zcta(zip_code))
+    if row is None:
+        raise ValueError(f"No location data for ZIP {zip_code}.")
+    df = load_uszips()
+    return float(df["lat"].iat[row]), float(df["lng"].iat[row])
+
+
+def zips_within(zip_or_point, radius_km: float) -> list[tuple[str, float]]:
+    """
+    ZIPs whose centroid lies within radius_km, as (zip, distance_km), nearest first.
+
+    Example:
+        zips_within("07306", 2) -> [("07306", 0.0), ...]
+    """
+    lat, lon = resolve_point(zip_or_point)
+    rows, dist = centroid_index().query_radius(lat, lon, radius_km)
+    return list(zip(_zip_array()[rows].tolist(), dist.tolist()))
+
+
+def nearest_zips(point, k: int = 1) -> list[tuple[str, float]]:
+    """
+    The k ZIPs with the nearest centroid to a (lat, lon) point (or a ZIP),
+    as (zip, distance_km), nearest first.
+    """
+    lat, lon = resolve_point(point)
+    rows, dist = centroid_index().query_nearest(lat, lon, k)
+    return list(zip(_zip_array()[rows].tolist(), dist.tolist()))
@@ -0,0 +1,128 @@
+# core/percentiles.py
+
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from config.settings import DATA_DIR
+from core.scoring_engine import weights_key
+from core.snapshot import SCORE_COLUMNS, ScoreSnapshot, load_snapshot
+
+# Sorted per-metric score distributions, national and per state
+PERCENTILES_PATH = DATA_DIR / "percentiles.npz"
+
+
+def build_percentile_tables(snapshot: ScoreSnapshot) -> dict:
+    """
+    Sorts every score column nationally and within each state.
+    Returns {"version", "national": {metric: arr}, "state": {state: {metric: arr}}}.
+    """
+    national = {name: np.sort(snapshot.column(name)) for name in SCORE_COLUMNS}
+
+    by_state = {}
+    for state in np.unique(snapshot.states).tolist():
+        if not state:
+            continue
+        mask = snapshot.states == state
+        by_state[state] = {name: np.sort(snapshot.column(name)[mask]) for name in SCORE_COLUMNS}
+
+    return {"version": snapshot.version, "national": national, "state": by_state}
+
+
+def save_percentile_tables(tables: dict, path: Path = PERCENTILES_PATH):
+    arrays = {"version": np.array(tables["version"])}
+    for name, values in tables["national"].items():
+        arrays[f"national/{name}"] = values
+    for state, columns in tables["state"].items():
+        for name, values in columns.items():
+            arrays[f"state/{state}/{name}"] = values
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.stem + ".tmp.npz")
+    np.savez_compressed(tmp, **arrays)
+    tmp.replace(path)
+
+
+def _read_percentile_tables(path: Path) -> dict:
+    tables = {"version": None, "national": {}, "state": {}}
+    with np.load(path) as f:
+        tables["version"] = str(f["version"])
+        for key in f.files:
+            parts = key.split("/")
+            if parts[0] == "national":
+                tables["national"][parts[1]] = f[key]
+            elif parts[0] == "state":
+                tables["state"].setdefault(parts[1], {})[parts[2]] = f[key]
+    return tables
+
+
+_tables: dict | None = None
+_lock = threading.Lock()
+
+
+def get_percentile_tables() -> dict | None:
+    """
+    Tables matching the current snapshot version.
+    Reloads from disk (or rebuilds from the snapshot) when the snapshot changes.
+    """
+    global _tables
+
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+
+    with _lock:
+        if _tables is not None and _tables["version"] == snapshot.version:
+            return _tables
+
+        tables = None
+        if PERCENTILES_PATH.exists():
+            try:
+                tables = _read_percentile_tables(PERCENTILES_PATH)
+            except Exception as e:
+                print(f"[percentiles] WARNING: Failed to read {PERCENTILES_PATH}: {e}")
+
+        if tables is None or tables["version"] != snapshot.version:
+            tables = build_percentile_tables(snapshot)
+
+        _tables = tables
+        return _tables
+
+
+def top_percent(sorted_values: np.ndarray, value: float) -> float | None:
+    """
+    Share of ZIPs scoring at least `value`, as a percentage (binary search).
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return None
+    at_or_above = n - int(np.searchsorted(sorted_values, value, side="left"))
+    return round(max(at_or_above, 1) / n * 100, 1)
+
+
+def percentile_ranks(scores: dict, state: str | None = None, weights: dict | None = None) -> dict:
+    """
+    "Top X%" for each score, nationally and within the ZIP's state.
+    Returns {metric: {"national": pct, "state": pct}} or {} without a snapshot.
+    The snapshot's overall scores use the default weights, so the overall is
+    only ranked when `weights` (those behind `scores`) are the defaults.
+    """
+    tables = get_percentile_tables()
+    if tables is None:
+        return {}
+
+    if weights_key(weights) != weights_key():
+        scores = {k: v for k, v in scores.items() if k != "OverallCivicScore"}
+
+    state_tables = tables["state"].get(state, {}) if state else {}
+
+    ranks = {}
+    for name, value in scores.items():
+        if name not in tables["national"]:
+            continue
+        ranks[name] = {
+            "national": top_percent(tables["national"][name], value),
+            "state": top_percent(state_tables[name], value) if name in state_tables else None,
+        }
+    return ranks
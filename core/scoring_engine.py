@@ -1,7 +1,34 @@
 # core/scoring_engine.py
 
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config.constants import METRIC_NAMES, NORMALIZATION_BOUNDS, NORMALIZATION_BOUNDS_VERSION
 from config.settings import settings
-from core.calculator import _normalize
+from core.calculator import _normalize, _normalize_array
+
+# Flat raw inputs used by compute_scores, in the order of a batch table row
+RAW_COLUMNS = [
+    "crime_per_1k",
+    "primary_care_centers",
+    "hospitals",
+    "is_hpsa",
+    "bachelors_rate",
+    "median_income",
+    "median_rent",
+    "rent_to_income",
+    "broadband_pct",
+    "aqi",
+    "parks",
+    "grocery_stores",
+    "clinics",
+    "transit_stops",
+]
 
 
 def safe_number(value, default=0.0):
@@ -17,7 +44,26 @@ def safe_number(value, default=0.0):
         return default
 
 
-def compute_scores(data: dict) -> dict:
+def get_weights() -> dict:
+    """
+    Metric weights for the overall score, read from settings.
+    """
+    return {
+        "Safety": settings.SAFETY_WEIGHT,
+        "Health": settings.HEALTH_WEIGHT,
+        "Education": settings.EDUCATION_WEIGHT,
+        "EconomicOpportunity": settings.ECONOMIC_WEIGHT,
+        "HousingAffordability": settings.HOUSING_WEIGHT,
+        "DigitalAccess": settings.DIGITAL_ACCESS_WEIGHT,
+        "Environment": settings.ENVIRONMENT_WEIGHT,
+        "Accessibility": settings.ACCESSIBILITY_WEIGHT,
+    }
+
+
+def compute_metric_scores(data: dict) -> dict:
+    """
+    The eight metric scores for one raw-data dict (no overall score).
+    """
     # =========================================================================
     # EXTRACT RAW DATA
     # =========================================================================
@@ -32,7 +78,7 @@ def compute_scores(data: dict) -> dict:
     #SAFETY SCORE
    
     crime_rate = safe_number(crime.get("crime_per_1k", 0))
-    safety = _normalize(crime_rate, "crime_per_1k", invert=True)
+    safety = _normalize(crime_rate, *NORMALIZATION_BOUNDS["crime_per_1k"], invert=True)
 
     
     # HEALTH SCORE
@@ -50,13 +96,13 @@ def compute_scores(data: dict) -> dict:
     # EDUCATION SCORE
     
     bachelors = safe_number(census.get("bachelors_rate", 0))
-    education = _normalize(bachelors, "bachelors_rate")
+    education = _normalize(bachelors, *NORMALIZATION_BOUNDS["bachelors_rate"])
 
   
     # ECONOMIC OPPORTUNITY
    
     median_income = safe_number(census.get("median_income", 0))
-    income_score = _normalize(median_income, "median_income")
+    income_score = _normalize(median_income, *NORMALIZATION_BOUNDS["median_income"])
 
     economic = round((education + income_score) / 2.0, 1)
 
@@ -68,26 +114,26 @@ def compute_scores(data: dict) -> dict:
 
     # 5A. Prefer rent burden if present from Census B25070
     if rent_burden is not None and rent_burden > 0:
-        housing_aff = _normalize(rent_burden, "rent_to_income", invert=True)
+        housing_aff = _normalize(rent_burden, *NORMALIZATION_BOUNDS["rent_to_income"], invert=True)
     else:
         # 5B. Fallback: derive rent burden from income & rent
         rent_to_income = (
             median_rent / median_income if median_income > 0 else 0.6
         )
         rent_to_income = safe_number(rent_to_income)
-        housing_aff = _normalize(rent_to_income, "rent_to_income", invert=True)
+        housing_aff = _normalize(rent_to_income, *NORMALIZATION_BOUNDS["rent_to_income"], invert=True)
 
     
     # DIGITAL ACCESS
 
     broadband_pct = safe_number(broadband.get("broadband_pct", 0))
-    digital = _normalize(broadband_pct, "broadband_pct")
+    digital = _normalize(broadband_pct, *NORMALIZATION_BOUNDS["broadband_pct"])
 
 
     #ENVIRONMENT (AIR QUALITY)
    
     aqi = safe_number(air.get("aqi", 0))
-    environment = _normalize(aqi, "aqi", invert=True)
+    environment = _normalize(aqi, *NORMALIZATION_BOUNDS["aqi"], invert=True)
 
     
     # ACCESSIBILITY (OSM Points)
@@ -114,28 +160,346 @@ def compute_scores(data: dict) -> dict:
         "Accessibility": round(accessibility, 1),
     }
 
-    #OVERALL SCORE (WEIGHTED AVERAGE)
+    return scores
 
-    weights = {
-        "Safety": settings.SAFETY_WEIGHT,
-        "Health": settings.HEALTH_WEIGHT,
-        "Education": settings.EDUCATION_WEIGHT,
-        "EconomicOpportunity": settings.ECONOMIC_WEIGHT,
-        "HousingAffordability": settings.HOUSING_WEIGHT,
-        "DigitalAccess": settings.DIGITAL_ACCESS_WEIGHT,
-        "Environment": settings.ENVIRONMENT_WEIGHT,
-        "Accessibility": settings.ACCESSIBILITY_WEIGHT,
-    }
+
+def compute_overall(metric_scores: dict, weights: dict | None = None) -> float:
+    """
+    Weighted average of the metric scores.
+    Cheap on its own, so weight changes only need to rerun this step.
+    """
+    weights = weights or get_weights()
 
     weighted_sum = 0.0
     weight_total = 0.0
 
-    for metric, value in scores.items():
+    for metric, value in metric_scores.items():
+        if metric == "OverallCivicScore":
+            continue
         w = float(weights.get(metric, 1.0))
         weighted_sum += value * w
         weight_total += w
 
     overall = weighted_sum / max(weight_total, 0.00001)
-    scores["OverallCivicScore"] = round(overall, 1)
+    return round(overall, 1)
+
+
+# Raw-data sections each metric is computed from
+METRIC_SOURCES = {
+    "Safety": ("crime",),
+    "Health": ("health",),
+    "Education": ("census",),
+    "EconomicOpportunity": ("census",),
+    "HousingAffordability": ("housing", "census"),
+    "DigitalAccess": ("broadband",),
+    "Environment": ("air_quality",),
+    "Accessibility": ("osm",),
+}
+
+
+def score_partial(data: dict, weights: dict | None = None) -> tuple[dict, list[str]]:
+    """
+    Scores for the metrics whose sources have all arrived, and the metrics
+    still pending. The overall score averages only the available metrics,
+    so it is provisional until `pending` is empty.
+    """
+    available = [m for m in METRIC_NAMES if all(src in data for src in METRIC_SOURCES[m])]
+    pending = [m for m in METRIC_NAMES if m not in available]
+    if not available:
+        return {}, pending
+
+    metrics = compute_metric_scores(data)
+    scores = {m: metrics[m] for m in available}
+    scores["OverallCivicScore"] = compute_overall(scores, weights)
+    return scores, pending
 
+
+def compute_scores(data: dict, weights: dict | None = None) -> dict:
+    scores = compute_metric_scores(data)
+    scores["OverallCivicScore"] = compute_overall(scores, weights)
     return scores
+
+
+# =============================================================================
+# MEMOIZED ENTRY POINT (use this from the app)
+# =============================================================================
+
+_SCORE_CACHE_SIZE = 512
+_metric_cache: OrderedDict = OrderedDict()
+_score_cache: OrderedDict = OrderedDict()
+_score_cache_lock = threading.Lock()
+
+
+def _cache_get(cache: OrderedDict, key):
+    with _score_cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key, value):
+    with _score_cache_lock:
+        value = cache.setdefault(key, value)
+        cache.move_to_end(key)
+        while len(cache) > _SCORE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return value
+
+
+def hash_raw_data(data: dict) -> str:
+    """
+    Stable hash of a raw-data dict (key order independent).
+    """
+    payload = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def weights_key(weights: dict | None = None) -> tuple:
+    """
+    Weight vector as a hashable tuple in METRIC_NAMES order.
+    """
+    weights = weights or get_weights()
+    return tuple(float(weights.get(metric, 1.0)) for metric in METRIC_NAMES)
+
+
+def score_zip(data: dict, weights: dict | None = None) -> dict:
+    """
+    Single scoring path for the app.
+    Memoized on (raw-data hash, weight vector, bounds version), so reruns,
+    score cards and charts all get the same result object back.
+    Metric scores are cached separately from the weights: a weight change
+    only recomputes the overall score from the cached metric vector.
+    The returned dict is shared: callers must copy before modifying it.
+    """
+    raw_key = (hash_raw_data(data), NORMALIZATION_BOUNDS_VERSION)
+    key = raw_key + (weights_key(weights),)
+
+    cached = _cache_get(_score_cache, key)
+    if cached is not None:
+        return cached
+
+    metrics = _cache_get(_metric_cache, raw_key)
+    if metrics is None:
+        metrics = _cache_put(_metric_cache, raw_key, compute_metric_scores(data))
+
+    scores = dict(metrics)
+    scores["OverallCivicScore"] = compute_overall(metrics, weights)
+    return _cache_put(_score_cache, key, scores)
+
+
+# =============================================================================
+# BATCH SCORING (many ZIPs at once)
+# =============================================================================
+
+def extract_raw_metrics(data: dict) -> dict:
+    """
+    Flattens one nested raw-data dict (from collect_all_data) into the
+    RAW_COLUMNS row consumed by compute_scores_batch.
+    """
+    census = data.get("census", {}) or {}
+    health = data.get("health", {}) or {}
+    crime = data.get("crime", {}) or {}
+    housing = data.get("housing", {}) or {}
+    broadband = data.get("broadband", {}) or {}
+    air = data.get("air_quality", {}) or {}
+    osm = data.get("osm", {}) or {}
+
+    # rent_to_income is used as-is (not through safe_number) by compute_scores;
+    # a missing burden is stored as NaN so the batch takes the fallback branch.
+    rent_burden = housing.get("rent_to_income")
+    if isinstance(rent_burden, bool) or not isinstance(rent_burden, (int, float)):
+        rent_burden = float("nan")
+
+    return {
+        "crime_per_1k": safe_number(crime.get("crime_per_1k", 0)),
+        "primary_care_centers": safe_number(health.get("primary_care_centers", 0)),
+        "hospitals": safe_number(health.get("hospitals", 0)),
+        "is_hpsa": bool(health.get("is_hpsa", False)),
+        "bachelors_rate": safe_number(census.get("bachelors_rate", 0)),
+        "median_income": safe_number(census.get("median_income", 0)),
+        "median_rent": safe_number(housing.get("median_rent", 0)),
+        "rent_to_income": float(rent_burden),
+        "broadband_pct": safe_number(broadband.get("broadband_pct", 0)),
+        "aqi": safe_number(air.get("aqi", 0)),
+        "parks": safe_number(osm.get("parks", 0)),
+        "grocery_stores": safe_number(osm.get("grocery_stores", 0)),
+        "clinics": safe_number(osm.get("clinics", 0)),
+        "transit_stops": safe_number(osm.get("transit_stops", 0)),
+    }
+
+
+def build_raw_frame(records: dict) -> pd.DataFrame:
+    """
+    Builds the columnar raw-metric table from {zip_code: raw_data}.
+    Build it once per snapshot; rescoring then only touches arrays.
+    """
+    rows = [extract_raw_metrics(data or {}) for data in records.values()]
+    frame = pd.DataFrame(rows, index=pd.Index(list(records.keys()), name="zip_code"), columns=RAW_COLUMNS)
+    return frame
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """
+    Rounds to one decimal exactly like Python's round(x, 1).
+    np.round scales by 10 first, which can land on the other side of a .5 tie,
+    so only those few tie candidates are re-rounded in Python.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 1)
+
+    scaled = values * 10.0
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(float(v), 1) for v in values[ties]]
+
+    return rounded
+
+
+def _column(raw: pd.DataFrame, name: str) -> np.ndarray:
+    return raw[name].to_numpy(dtype=float)
+
+
+def compute_metric_scores_batch(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the eight metric scores for every row of a RAW_COLUMNS table.
+    Same math as compute_scores, expressed as array operations.
+    """
+    # SAFETY
+    safety = _normalize_array(_column(raw, "crime_per_1k"), *NORMALIZATION_BOUNDS["crime_per_1k"], invert=True)
+
+    # HEALTH
+    primary_care_points = np.minimum(_column(raw, "primary_care_centers") * 3, 40)
+    hospital_points = np.minimum(_column(raw, "hospitals") * 10, 30)
+    raw_health = primary_care_points + hospital_points
+    raw_health = np.where(raw["is_hpsa"].to_numpy(dtype=bool), raw_health - 15, raw_health)
+    health_score = np.minimum(np.maximum(raw_health * 2.5, 0), 100)
+
+    # EDUCATION
+    median_income = _column(raw, "median_income")
+    education = _normalize_array(_column(raw, "bachelors_rate"), *NORMALIZATION_BOUNDS["bachelors_rate"])
+
+    # ECONOMIC OPPORTUNITY
+    income_score = _normalize_array(median_income, *NORMALIZATION_BOUNDS["median_income"])
+    economic = _round1((education + income_score) / 2.0)
+
+    # HOUSING AFFORDABILITY (burden if present, else rent / income)
+    rent_burden = _column(raw, "rent_to_income")
+    has_burden = rent_burden > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derived = np.where(median_income > 0, _column(raw, "median_rent") / median_income, 0.6)
+    rent_to_income = np.where(has_burden, rent_burden, derived)
+    housing_aff = _normalize_array(rent_to_income, *NORMALIZATION_BOUNDS["rent_to_income"], invert=True)
+
+    # DIGITAL ACCESS
+    digital = _normalize_array(_column(raw, "broadband_pct"), *NORMALIZATION_BOUNDS["broadband_pct"])
+
+    # ENVIRONMENT
+    environment = _normalize_array(_column(raw, "aqi"), *NORMALIZATION_BOUNDS["aqi"], invert=True)
+
+    # ACCESSIBILITY
+    poi_total = (
+        _column(raw, "parks") * 3
+        + _column(raw, "grocery_stores") * 2
+        + _column(raw, "clinics") * 4
+        + _column(raw, "transit_stops") * 1
+    )
+    accessibility = np.minimum(_round1((poi_total / 200) * 100), 100)
+
+    return pd.DataFrame(
+        {
+            "Safety": _round1(safety),
+            "Health": _round1(health_score),
+            "Education": _round1(education),
+            "EconomicOpportunity": _round1(economic),
+            "HousingAffordability": _round1(housing_aff),
+            "DigitalAccess": _round1(digital),
+            "Environment": _round1(environment),
+            "Accessibility": _round1(accessibility),
+        },
+        index=raw.index,
+    )
+
+
+def compute_overall_batch(metric_scores: pd.DataFrame, weights: dict | None = None) -> np.ndarray:
+    """
+    Weighted overall score for every row of a metric-score table.
+    Accumulates metric by metric (same order as compute_scores) so the
+    floating-point result is identical to the per-ZIP loop.
+    """
+    weights = weights or get_weights()
+
+    weighted_sum = np.zeros(len(metric_scores))
+    weight_total = 0.0
+
+    for metric in METRIC_NAMES:
+        w = float(weights.get(metric, 1.0))
+        weighted_sum = weighted_sum + metric_scores[metric].to_numpy(dtype=float) * w
+        weight_total += w
+
+    return _round1(weighted_sum / max(weight_total, 0.00001))
+
+
+def compute_scores_batch(raw: pd.DataFrame, weights: dict | None = None) -> pd.DataFrame:
+    """
+    Vectorized compute_scores for a columnar table of raw metrics.
+
+    Args:
+        raw: DataFrame with RAW_COLUMNS (see build_raw_frame), one row per ZIP
+        weights: optional metric weights, defaults to settings
+
+    Returns a DataFrame with the eight metric scores plus OverallCivicScore,
+    row for row equal to compute_scores on the same inputs.
+    """
+    if not isinstance(raw, pd.DataFrame):
+        raw = pd.DataFrame(raw)
+
+    scores = compute_metric_scores_batch(raw)
+    scores["OverallCivicScore"] = compute_overall_batch(scores, weights)
+    return scores
+
+
+# =============================================================================
+# MULTI-PROFILE OVERALL SCORES (one matrix pass)
+# =============================================================================
+
+def metric_vector(scores: dict) -> np.ndarray:
+    """
+    Metric scores as a vector in METRIC_NAMES order.
+    """
+    return np.array([float(scores.get(metric, 0.0)) for metric in METRIC_NAMES])
+
+
+def weight_matrix(weight_rows: list[dict]) -> np.ndarray:
+    """
+    Stacks weight dicts into a (profiles x metrics) matrix of raw weights.
+    Rows are not normalized: compute_overall_matrix divides by the total
+    the same way compute_overall does.
+    """
+    return np.array([[float(w.get(metric, 1.0)) for metric in METRIC_NAMES] for w in weight_rows])
+
+
+def compute_overall_matrix(metric_scores, weights: np.ndarray) -> np.ndarray:
+    """
+    Overall scores for every weight profile at once.
+    Accumulates metric by metric and divides by the weight total like
+    compute_overall, so every profile rounds exactly as the per-ZIP score.
+
+    Args:
+        metric_scores: one metric vector (8,) or a batch (n x 8) / DataFrame
+        weights: (profiles x 8) matrix from weight_matrix
+
+    Returns (profiles,) for one ZIP or (n x profiles) for a batch.
+    """
+    if isinstance(metric_scores, pd.DataFrame):
+        metric_scores = metric_scores[METRIC_NAMES].to_numpy(dtype=float)
+    metric_scores = np.asarray(metric_scores, dtype=float)
+
+    weighted_sum = np.zeros(metric_scores.shape[:-1] + (len(weights),))
+    weight_total = np.zeros(len(weights))
+
+    for j in range(len(METRIC_NAMES)):
+        weighted_sum = weighted_sum + metric_scores[..., j, None] * weights[:, j]
+        weight_total = weight_total + weights[:, j]
+
+    return _round1(weighted_sum / np.maximum(weight_total, 0.00001))
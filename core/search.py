@@ -0,0 +1,107 @@
+# core/search.py
+
+import heapq
+import operator
+import threading
+
+import numpy as np
+
+from config.constants import METRIC_NAMES
+from core.geo_utils import centroid_index, resolve_point
+from core.scoring_engine import compute_overall_matrix, weight_matrix
+from core.snapshot import ScoreSnapshot, load_snapshot
+from data_sources.uszips import load_uszips
+
+KM_PER_MILE = 1.609344
+
+_OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_row_map: dict = {}
+_row_map_lock = threading.Lock()
+
+
+def _snapshot_rows(snapshot: ScoreSnapshot) -> np.ndarray:
+    """
+    Maps centroid-index rows (uszips order) to snapshot rows, -1 if not cached.
+    Built once per snapshot version.
+    """
+    with _row_map_lock:
+        cached = _row_map.get("version")
+        if cached == snapshot.version:
+            return _row_map["rows"]
+
+        rows = [snapshot.row_of(z) for z in load_uszips()["zip"].tolist()]
+        rows = np.array([-1 if r is None else r for r in rows], dtype=np.int64)
+
+        _row_map.clear()
+        _row_map.update(version=snapshot.version, rows=rows)
+        return rows
+
+
+def best_zips_near(
+    zip_or_point,
+    radius_miles: float,
+    weights: dict,
+    k: int = 10,
+    filters: list[tuple] | None = None,
+) -> list[dict]:
+    """
+    Top-K cached ZIPs within radius_miles of a ZIP or (lat, lon), ranked by
+    the weighted overall score for `weights` (e.g. a persona's profile).
+
+    Args:
+        filters: optional (metric, op, value) tuples, e.g. ("HousingAffordability", ">", 60)
+
+    Answers from the centroid index and the score snapshot only; no API calls.
+    Raises ValueError for an unassigned ZIP (see resolve_point).
+    """
+    lat, lon = resolve_point(zip_or_point)
+
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return []
+
+    index_rows, dist_km = centroid_index().query_radius(lat, lon, radius_miles * KM_PER_MILE)
+
+    score_rows = _snapshot_rows(snapshot)[index_rows]
+    cached = score_rows >= 0
+    index_rows, dist_km, score_rows = index_rows[cached], dist_km[cached], score_rows[cached]
+
+    metric_scores = snapshot.scores[score_rows][:, : len(METRIC_NAMES)]
+
+    if filters:
+        keep = np.ones(len(score_rows), dtype=bool)
+        for metric, op, value in filters:
+            keep &= _OPS[op](metric_scores[:, METRIC_NAMES.index(metric)], float(value))
+        index_rows, dist_km, score_rows, metric_scores = (
+            index_rows[keep], dist_km[keep], score_rows[keep], metric_scores[keep]
+        )
+
+    if len(score_rows) == 0:
+        return []
+
+    overall = compute_overall_matrix(metric_scores, weight_matrix([weights]))[:, 0]
+
+    # Heap-based top-K (ties go to the closer ZIP: rows are sorted by distance)
+    top = heapq.nlargest(k, range(len(overall)), key=lambda i: (overall[i], -i))
+
+    table = load_uszips()
+    results = []
+    for i in top:
+        info = table.iloc[int(index_rows[i])]
+        row = {
+            "zip": info["zip"],
+            "city": info["city"],
+            "state": info["state_id"],
+            "distance_miles": round(float(dist_km[i]) / KM_PER_MILE, 1),
+            "score": float(overall[i]),
+        }
+        row.update(dict(zip(METRIC_NAMES, metric_scores[i].tolist())))
+        results.append(row)
+
+    return results
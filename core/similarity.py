@@ -0,0 +1,154 @@
+# core/similarity.py
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from config.constants import METRIC_NAMES
+from core.scoring_engine import metric_vector
+from core.snapshot import load_snapshot
+
+
+@dataclass(frozen=True)
+class _Rows:
+    """
+    One consistent version of the index arrays; replaced whole, never mutated.
+    """
+    zips: tuple
+    states: np.ndarray
+    vectors: np.ndarray
+    sq_norms: np.ndarray
+    row: dict
+
+
+class SimilarityIndex:
+    """
+    In-memory nearest-neighbour index over the eight metric scores.
+    Squared distances come from one matrix-vector product:
+        |a - b|^2 = |a|^2 + |b|^2 - 2 a.b
+    Upserts build a new _Rows and swap it in with one assignment, so readers
+    never see arrays from two different versions. `generation` counts the
+    upserts that changed something, for callers that cache results.
+    """
+
+    def __init__(self, zips, states, vectors, version: str | None = None):
+        self.version = version
+        vectors = np.asarray(vectors, dtype=float) / 100.0
+        self._rows = _Rows(
+            zips=tuple(zips),
+            states=np.asarray(states, dtype="U2"),
+            vectors=vectors,
+            sq_norms=np.einsum("ij,ij->i", vectors, vectors),
+            row={z: i for i, z in enumerate(zips)},
+        )
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows.zips)
+
+    def upsert(self, zip_code: str, state: str | None, scores: dict):
+        """
+        Adds or refreshes one ZIP (e.g. right after a live analysis).
+        """
+        vector = metric_vector(scores) / 100.0
+        state = state or ""
+
+        with self._lock:
+            rows = self._rows
+            i = rows.row.get(zip_code)
+            if i is None:
+                self._rows = _Rows(
+                    zips=rows.zips + (zip_code,),
+                    states=np.append(rows.states, np.array([state], dtype="U2")),
+                    vectors=np.vstack([rows.vectors, vector]),
+                    sq_norms=np.append(rows.sq_norms, vector @ vector),
+                    row={**rows.row, zip_code: len(rows.zips)},
+                )
+                self.generation += 1
+                return
+
+            if rows.states[i] == state and np.array_equal(rows.vectors[i], vector):
+                return
+
+            states, vectors, sq_norms = rows.states.copy(), rows.vectors.copy(), rows.sq_norms.copy()
+            states[i] = state
+            vectors[i] = vector
+            sq_norms[i] = vector @ vector
+            self._rows = _Rows(rows.zips, states, vectors, sq_norms, rows.row)
+            self.generation += 1
+
+    def most_similar(self, zip_code: str, k: int = 10, state: str | None = None, scores: dict | None = None) -> list[dict]:
+        """
+        K ZIPs closest to zip_code in metric space, optionally within one state.
+        `scores` is used when the ZIP itself is not in the index.
+        """
+        rows = self._rows
+
+        row = rows.row.get(zip_code)
+        if row is not None:
+            query = rows.vectors[row]
+        elif scores is not None:
+            query = metric_vector(scores) / 100.0
+        else:
+            return []
+
+        sq_dist = rows.sq_norms - 2.0 * (rows.vectors @ query) + query @ query
+
+        candidates = np.ones(len(rows.zips), dtype=bool)
+        if state:
+            candidates &= rows.states == state
+        if row is not None:
+            candidates[row] = False
+
+        pool = np.flatnonzero(candidates)
+        if len(pool) == 0:
+            return []
+
+        k = min(k, len(pool))
+        nearest = pool[np.argpartition(sq_dist[pool], k - 1)[:k]]
+        nearest = nearest[np.argsort(sq_dist[nearest], kind="stable")]
+
+        # Max distance between two score vectors in [0, 1]^8
+        max_dist = np.sqrt(len(METRIC_NAMES))
+        results = []
+        for i in nearest.tolist():
+            dist = float(np.sqrt(max(sq_dist[i], 0.0)))
+            results.append({
+                "zip": rows.zips[i],
+                "state": str(rows.states[i]),
+                "similarity": round(float(1 - dist / max_dist) * 100, 1),
+                **dict(zip(METRIC_NAMES, np.round(rows.vectors[i] * 100, 1).tolist())),
+            })
+        return results
+
+
+_index: SimilarityIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """
+    Index for the current score snapshot; rebuilt only when the snapshot
+    version changes, with live upserts applied in between.
+    """
+    global _index
+
+    snapshot = load_snapshot()
+
+    with _index_lock:
+        if snapshot is None:
+            if _index is None:
+                _index = SimilarityIndex([], [], np.empty((0, len(METRIC_NAMES))))
+            return _index
+
+        if _index is None or _index.version != snapshot.version:
+            _index = SimilarityIndex(
+                snapshot.zips.tolist(),
+                snapshot.states,
+                snapshot.scores[:, : len(METRIC_NAMES)],
+                version=snapshot.version,
+            )
+        return _index
+
@@ -0,0 +1,125 @@
+# core/snapshot.py
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from config.constants import METRIC_NAMES, NORMALIZATION_BOUNDS_VERSION
+from config.settings import DATA_DIR
+from core.scoring_engine import RAW_COLUMNS, build_raw_frame, compute_scores_batch
+from data_sources.uszips import zip_to_state_map
+
+# Nationwide score matrix built from every cached ZIP (see scripts/build_snapshot.py)
+SNAPSHOT_PATH = DATA_DIR / "score_snapshot.npz"
+
+SCORE_COLUMNS = METRIC_NAMES + ["OverallCivicScore"]
+
+
+@dataclass
+class ScoreSnapshot:
+    """
+    Columnar view of all cached ZIPs.
+    scores has one row per ZIP and SCORE_COLUMNS as columns.
+    """
+    version: str
+    zips: np.ndarray
+    states: np.ndarray
+    raw: np.ndarray
+    scores: np.ndarray
+    _row: dict = field(default_factory=dict, repr=False)
+
+    def __len__(self):
+        return len(self.zips)
+
+    def row_of(self, zip_code: str) -> int | None:
+        if not self._row:
+            self._row = {z: i for i, z in enumerate(self.zips.tolist())}
+        return self._row.get(zip_code)
+
+    def column(self, name: str) -> np.ndarray:
+        return self.scores[:, SCORE_COLUMNS.index(name)]
+
+
+def build_snapshot(records: dict) -> ScoreSnapshot:
+    """
+    Scores {zip_code: raw_data} in one vectorized batch.
+    """
+    raw = build_raw_frame(records)
+    scores = compute_scores_batch(raw)
+
+    zips = np.array(raw.index.tolist(), dtype="U5")
+    states = zip_to_state_map()
+    state_ids = np.array([states.get(z) or "" for z in zips.tolist()], dtype="U2")
+
+    raw_matrix = raw[RAW_COLUMNS].to_numpy(dtype=float)
+    score_matrix = scores[SCORE_COLUMNS].to_numpy(dtype=float)
+
+    digest = hashlib.sha1()
+    digest.update(zips.tobytes())
+    digest.update(score_matrix.tobytes())
+    digest.update(str(NORMALIZATION_BOUNDS_VERSION).encode())
+    built_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    version = f"{built_at}-{digest.hexdigest()[:12]}"
+
+    return ScoreSnapshot(version, zips, state_ids, raw_matrix, score_matrix)
+
+
+def save_snapshot(snapshot: ScoreSnapshot, path: Path = SNAPSHOT_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.stem + ".tmp.npz")
+    np.savez_compressed(
+        tmp,
+        version=np.array(snapshot.version),
+        zips=snapshot.zips,
+        states=snapshot.states,
+        raw=snapshot.raw,
+        scores=snapshot.scores,
+    )
+    # Swap atomically so readers never see a half-written file
+    tmp.replace(path)
+
+
+def _read_snapshot(path: Path) -> ScoreSnapshot:
+    with np.load(path) as f:
+        return ScoreSnapshot(
+            version=str(f["version"]),
+            zips=f["zips"],
+            states=f["states"],
+            raw=f["raw"],
+            scores=f["scores"],
+        )
+
+
+_loaded: dict = {}
+_lock = threading.Lock()
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> ScoreSnapshot | None:
+    """
+    Returns the current snapshot, or None if none has been built.
+    Re-reads the file only when it changes on disk (cheap stat per call).
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        entry = _loaded.get(path)
+        if entry and entry[0] == stamp:
+            return entry[1]
+
+        try:
+            snapshot = _read_snapshot(path)
+        except Exception as e:
+            print(f"[snapshot] WARNING: Failed to read {path}: {e}")
+            return entry[1] if entry else None
+
+        _loaded[path] = (stamp, snapshot)
+        return snapshot
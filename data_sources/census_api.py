@@ -3,6 +3,7 @@
 import time
 import requests
 from config.settings import settings
+from data_sources.request_dedup import shared_call
 
 # =============================
 # API KEY (optional, but helps)
@@ -57,6 +58,7 @@ def _census(vars: str, zip_code: str):
 # ============================================================
 # MAIN FETCH FUNCTION
 # ============================================================
+@shared_call()
 def fetch_census_data(zip_code: str) -> dict:
     """
     Fetch Census ZIP-level:
@@ -4,6 +4,7 @@ import requests
 import functools
 import time
 from config.settings import settings
+from data_sources.request_dedup import shared_call
 from core.geo_utils import zip_to_latlon
 
 # ==========================================
@@ -79,6 +80,7 @@ def cached_query(lat, lon, key, value):
 # ==========================================
 # Public function used by your app
 # ==========================================
+@shared_call()
 def fetch_osm_poi_data(zip_code: str) -> dict:
     # MOCK MODE (unchanged behavior!)
     if settings.USE_MOCK_DATA:
@@ -0,0 +1,201 @@
+# data_sources/place_index.py
+
+import functools
+import pickle
+import re
+import threading
+
+import numpy as np
+from rapidfuzz import fuzz
+
+from config.settings import DATA_DIR
+from data_sources.uszips import USZIPS_XLSX, load_uszips
+
+# Prebuilt place-name index (normalized names + trigram postings)
+PLACE_INDEX_PATH = DATA_DIR / "place_index.pkl"
+PLACE_INDEX_VERSION = 1
+
+# How many trigram-ranked places get a full RapidFuzz comparison
+_FUZZY_POOL = 40
+
+_ABBREVIATIONS = {
+    "st": "saint",
+    "ste": "sainte",
+    "ft": "fort",
+    "mt": "mount",
+    "pt": "point",
+    "twp": "township",
+}
+
+
+def _clean(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9 ]+", " ", (text or "").lower()).split())
+
+
+def _expand(text: str) -> str:
+    return " ".join(_ABBREVIATIONS.get(t, t) for t in text.split())
+
+
+def normalize_place(text: str) -> str:
+    """
+    Lowercase, strip punctuation and expand common abbreviations.
+    """
+    return _expand(_clean(text))
+
+
+def _trigrams(name: str) -> set:
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_place_index() -> dict:
+    """
+    One entry per (city, state) and per (county, state), each with its ZIPs
+    ordered by population, plus a trigram -> place ids inverted index.
+    """
+    df = load_uszips().copy()
+    df["population"] = df["population"].fillna(0)
+
+    places = []
+    for kind, column, suffix in (("city", "city", ""), ("county", "county_name", " county")):
+        grouped = df.sort_values("population", ascending=False).groupby([column, "state_id"], sort=False)
+        for (name, state), group in grouped:
+            places.append({
+                "name": normalize_place(f"{name}{suffix}"),
+                "label": f"{name}{suffix.title()}, {state}",
+                "state": state,
+                "kind": kind,
+                "zips": group["zip"].tolist(),
+                "population": float(group["population"].sum()),
+            })
+
+    postings = {}
+    for pid, place in enumerate(places):
+        for gram in _trigrams(place["name"]):
+            postings.setdefault(gram, []).append(pid)
+
+    states = {}
+    for state_id, state_name in df[["state_id", "state_name"]].drop_duplicates().itertuples(index=False):
+        states[state_id.lower()] = state_id
+        states[_clean(state_name)] = state_id
+
+    return {
+        "version": PLACE_INDEX_VERSION,
+        "places": places,
+        "postings": {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()},
+        "states": states,
+        "state_places": {
+            state: np.array([i for i, p in enumerate(places) if p["state"] == state], dtype=np.int64)
+            for state in sorted({p["state"] for p in places})
+        },
+        "zip_info": {
+            z: (c, s, county)
+            for z, c, s, county in df[["zip", "city", "state_id", "county_name"]].itertuples(index=False)
+        },
+    }
+
+
+def save_place_index(index: dict):
+    PLACE_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = PLACE_INDEX_PATH.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(PLACE_INDEX_PATH)
+
+
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _load_place_index() -> dict:
+    fresh = PLACE_INDEX_PATH.exists() and PLACE_INDEX_PATH.stat().st_mtime >= USZIPS_XLSX.stat().st_mtime
+    if fresh:
+        try:
+            with open(PLACE_INDEX_PATH, "rb") as f:
+                index = pickle.load(f)
+            if index.get("version") == PLACE_INDEX_VERSION:
+                return index
+        except Exception as e:
+            print(f"[place_index] WARNING: Rebuilding unreadable index: {e}")
+
+    index = build_place_index()
+    try:
+        save_place_index(index)
+    except Exception as e:
+        print(f"[place_index] WARNING: Could not write {PLACE_INDEX_PATH}: {e}")
+    return index
+
+
+def get_place_index() -> dict:
+    with _lock:
+        return _load_place_index()
+
+
+def _split_state(query: str, states: dict) -> tuple[str, str | None]:
+    """
+    Peels a trailing state ("Hoboken NJ", "Jersey City, New Jersey") off a
+    cleaned, not yet expanded query, so "MT" stays Montana instead of "mount".
+    """
+    tokens = query.split()
+    for width in (3, 2, 1):
+        if len(tokens) > width:
+            tail = " ".join(tokens[-width:])
+            if tail in states:
+                return " ".join(tokens[:-width]), states[tail]
+    return query, None
+
+
+def resolve_place(text: str, limit: int = 10) -> list[dict]:
+    """
+    Ranked ZIP candidates for a free-text location such as "Hoboken NJ".
+    Each result: {"zip", "city", "state", "county", "place", "score"}.
+    """
+    index = get_place_index()
+    query, state = _split_state(_clean(text), index["states"])
+    query = _expand(query)
+    if not query:
+        return []
+
+    # Trigram overlap narrows 30k places down to a small pool
+    grams = [index["postings"][g] for g in _trigrams(query) if g in index["postings"]]
+    if not grams:
+        return []
+    hits = np.bincount(np.concatenate(grams), minlength=len(index["places"]))
+
+    candidates = np.arange(len(hits))
+    if state and state in index["state_places"]:
+        in_state = index["state_places"][state]
+        if hits[in_state].any():
+            candidates = in_state
+
+    pool_size = min(_FUZZY_POOL, len(candidates))
+    pool = candidates[np.argpartition(-hits[candidates], pool_size - 1)[:pool_size]]
+    places = index["places"]
+
+    ranked = sorted(
+        (
+            (fuzz.WRatio(query, places[i]["name"]), places[i]["kind"] == "city", places[i]["population"], i)
+            for i in pool.tolist()
+        ),
+        reverse=True,
+    )
+
+    results, seen = [], set()
+    for score, _, _, pid in ranked:
+        place = places[pid]
+        for zip_code in place["zips"]:
+            if zip_code in seen:
+                continue
+            seen.add(zip_code)
+            city, zip_state, county = index["zip_info"][zip_code]
+            results.append({
+                "zip": zip_code,
+                "city": city,
+                "state": zip_state,
+                "county": county,
+                "place": place["label"],
+                "score": round(float(score), 1),
+            })
+            if len(results) >= limit:
+                return results
+    return results
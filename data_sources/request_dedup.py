@@ -0,0 +1,62 @@
+# data_sources/request_dedup.py
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def shared_call(ttl_seconds: float = 600, maxsize: int = 2048):
+    """
+    Deduplicates upstream fetches across threads.
+    Concurrent calls with the same arguments wait for a single in-flight
+    request, and the result is reused for ttl_seconds afterwards.
+    Results are shared objects: callers must not modify them.
+    """
+
+    def decorator(fn):
+        lock = threading.Lock()
+        inflight: dict = {}
+        results: OrderedDict = OrderedDict()
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = args
+            now = time.monotonic()
+
+            with lock:
+                hit = results.get(key)
+                if hit is not None and now - hit[0] < ttl_seconds:
+                    return hit[1]
+
+                future = inflight.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    inflight[key] = future
+
+            if not owner:
+                return future.result()
+
+            try:
+                value = fn(*args)
+            except Exception as e:
+                future.set_exception(e)
+                with lock:
+                    inflight.pop(key, None)
+                raise
+
+            with lock:
+                results[key] = (time.monotonic(), value)
+                results.move_to_end(key)
+                while len(results) > maxsize:
+                    results.popitem(last=False)
+                inflight.pop(key, None)
+            future.set_result(value)
+            return value
+
+        wrapper.cache_clear = lambda: results.clear()
+        return wrapper
+
+    return decorator
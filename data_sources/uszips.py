@@ -0,0 +1,75 @@
+# data_sources/uszips.py
+
+import functools
+
+import pandas as pd
+
+from config.settings import DATA_DIR, PROJECT_ROOT
+
+# Bundled SimpleMaps ZIP table (centroids, city, county, state)
+USZIPS_XLSX = PROJECT_ROOT / "simplemaps_uszips_basicv1.92" / "uszips.xlsx"
+
+# Parsing the xlsx takes seconds, so a pickled copy is kept next to the other artifacts
+USZIPS_CACHE = DATA_DIR / "uszips.pkl"
+
+USZIPS_COLUMNS = [
+    "zip",
+    "lat",
+    "lng",
+    "city",
+    "state_id",
+    "state_name",
+    "county_name",
+    "population",
+    "zcta",
+    "parent_zcta",
+]
+
+
+def _read_xlsx() -> pd.DataFrame:
+    df = pd.read_excel(USZIPS_XLSX, dtype={"zip": str, "parent_zcta": str})
+    df = df[[c for c in USZIPS_COLUMNS if c in df.columns]].copy()
+
+    # Excel drops leading zeros ("601" -> "00601")
+    df["zip"] = df["zip"].astype(str).str.zfill(5)
+    if "parent_zcta" in df.columns:
+        df["parent_zcta"] = df["parent_zcta"].where(df["parent_zcta"].notna(), None)
+        df["parent_zcta"] = df["parent_zcta"].map(lambda z: str(z).split(".")[0].zfill(5) if z else None)
+
+    return df.reset_index(drop=True)
+
+
+@functools.lru_cache(maxsize=1)
+def load_uszips() -> pd.DataFrame:
+    """
+    Loads the ZIP table once per process.
+    Columns: zip, lat, lng, city, state_id, state_name, county_name, population, zcta, parent_zcta.
+    """
+    if USZIPS_CACHE.exists() and USZIPS_CACHE.stat().st_mtime >= USZIPS_XLSX.stat().st_mtime:
+        try:
+            return pd.read_pickle(USZIPS_CACHE)
+        except Exception as e:
+            print(f"[uszips] WARNING: Ignoring unreadable cache {USZIPS_CACHE}: {e}")
+
+    df = _read_xlsx()
+
+    try:
+        USZIPS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(USZIPS_CACHE)
+    except Exception as e:
+        print(f"[uszips] WARNING: Could not write cache {USZIPS_CACHE}: {e}")
+
+    return df
+
+
+@functools.lru_cache(maxsize=1)
+def zip_to_state_map() -> dict:
+    """
+    {zip: state_id} for every ZIP in the table.
+    """
+    df = load_uszips()
+    return dict(zip(df["zip"], df["state_id"]))
+
+
+def zip_state(zip_code: str) -> str | None:
+    return zip_to_state_map().get(zip_code)
@@ -1,10 +1,135 @@
 # data_sources/zip_validator.py
+import csv
+import functools
 import re
+from pathlib import Path
+
+import numpy as np
+
+from config.settings import DATA_DIR
+
+# Compact membership bitmap of real ZCTAs (built from the uszips table)
+ZIP_BITMAP_PATH = DATA_DIR / "zip_bitmap.bin"
+
+_ZIP_PATTERN = re.compile(r"\d{5}")
+
+# Explicit ZIP -> ZCTA crosswalk for real ZIPs that are not ZCTAs themselves
+# (PO-box and unique ZIPs). Regenerate with scripts/build_zip_crosswalk.py.
+ZIP_CROSSWALK_PATH = Path(__file__).resolve().parent / "zip_zcta_crosswalk.csv"
+
+# Military APO/FPO prefixes (AE, AA, AP): real ZIPs, but overseas with no
+# US location or Census data, so the app cannot analyze them
+MILITARY_PREFIXES = frozenset({"340", *(f"{p:03d}" for p in range(90, 99)), *(f"{p:03d}" for p in range(962, 967))})
+
+
+def build_zip_membership() -> bytearray:
+    """
+    100k-bit bitmap, bit n set = n is a ZCTA (a ZIP with Census geography).
+    """
+    from data_sources.uszips import load_uszips
+
+    bitmap = bytearray(100_000 // 8)
+    for zip_code in load_uszips()["zip"]:
+        n = int(zip_code)
+        bitmap[n >> 3] |= 1 << (n & 7)
+    return bitmap
+
+
+@functools.lru_cache(maxsize=1)
+def _bitmap() -> bytes:
+    """
+    ZCTA membership bitmap, read from ZIP_BITMAP_PATH or built and saved there.
+    """
+    try:
+        bitmap = ZIP_BITMAP_PATH.read_bytes()
+        if len(bitmap) == 100_000 // 8:
+            return bitmap
+    except OSError:
+        pass
+
+    bitmap = bytes(build_zip_membership())
+    try:
+        ZIP_BITMAP_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ZIP_BITMAP_PATH.write_bytes(bitmap)
+    except OSError as e:
+        print(f"[zip_validator] WARNING: Could not write membership file: {e}")
+    return bitmap
+
+
+def load_zip_crosswalk(path: Path = ZIP_CROSSWALK_PATH) -> dict[str, str]:
+    """
+    {zip: zcta} from the crosswalk CSV (columns zip, zcta). Rows whose
+    target is not a ZCTA are dropped with a warning.
+    """
+    crosswalk = {}
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [row for row in csv.DictReader(f) if row.get("zip") and not row["zip"].startswith("#")]
+    except OSError as e:
+        print(f"[zip_validator] WARNING: Could not read {path}: {e}")
+        return crosswalk
+
+    for row in rows:
+        zip_code, zcta = row["zip"].strip(), (row.get("zcta") or "").strip()
+        if not is_zcta(zcta):
+            print(f"[zip_validator] WARNING: Crosswalk maps {zip_code} to non-ZCTA {zcta!r}; skipped")
+            continue
+        crosswalk[zip_code] = zcta
+    return crosswalk
+
+
+@functools.lru_cache(maxsize=1)
+def _crosswalk() -> dict[str, str]:
+    return load_zip_crosswalk()
+
+
+def is_zcta(zip_code: str) -> bool:
+    if not _ZIP_PATTERN.fullmatch(zip_code):
+        return False
+    n = int(zip_code)
+    return bool(_bitmap()[n >> 3] & (1 << (n & 7)))
+
+
+def is_military_zip(zip_code: str) -> bool:
+    return bool(_ZIP_PATTERN.fullmatch(zip_code)) and zip_code[:3] in MILITARY_PREFIXES
+
+
+def zip_error(zip_code: str) -> str | None:
+    """
+    Why a ZIP cannot be analyzed, or None if it can. No network calls.
+    """
+    zip_code = (zip_code or "").strip()
+    if not _ZIP_PATTERN.fullmatch(zip_code):
+        return "Please enter a 5-digit US ZIP code."
+    if is_military_zip(zip_code):
+        return f"{zip_code} is a military APO/FPO ZIP code; overseas addresses have no location data to analyze."
+    if not is_zcta(zip_code) and zip_code not in _crosswalk():
+        return f"{zip_code} is not a known US ZIP code (neither a ZCTA nor in the ZIP crosswalk)."
+    return None
 
 
 def is_valid_us_zip(zip_code: str) -> bool:
-    return bool(re.fullmatch(r"\d{5}", zip_code.strip()))
+    """
+    True for ZCTAs and for ZIPs listed in the crosswalk (PO-box and unique
+    ZIPs). Rejects malformed, unassigned and military ZIPs.
+    """
+    return zip_error(zip_code) is None
+
+
+def to_zcta(zip_code: str) -> str | None:
+    """
+    ZCTA for Census-based lookups and centroids: the ZIP itself when it is a
+    ZCTA, else its crosswalk entry; None for ZIPs without one.
+    """
+    if is_zcta(zip_code):
+        return zip_code
+    return _crosswalk().get(zip_code)
 
 
 def normalize_zip(zip_code: str) -> str:
     return zip_code.strip()
+
+
+def looks_like_zip(text: str) -> bool:
+    """True for ZIP-shaped input (digits), False for place names like "Hoboken NJ"."""
+    return bool(re.fullmatch(r"\d{3,5}(-\d{4})?", (text or "").strip()))
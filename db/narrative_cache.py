@@ -0,0 +1,25 @@
+from .supabase_client import supabase
+from datetime import datetime, timezone
+
+def get_cached_narrative(cache_key: str):
+    try:
+        res = supabase.table("narrative_cache").select("narrative").eq("cache_key", cache_key).execute()
+        if res.data and len(res.data):
+            return res.data[0]["narrative"]
+    except Exception as e:
+        print(f"[NARRATIVE CACHE] WARNING: Failed to fetch narrative {cache_key}: {e}")
+    return None
+
+
+def store_narrative(cache_key: str, zip_code: str, persona: str, model: str, narrative: str):
+    try:
+        supabase.table("narrative_cache").upsert({
+            "cache_key": cache_key,
+            "zip_code": zip_code,
+            "persona": persona,
+            "model": model,
+            "narrative": narrative,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }).execute()
+    except Exception as e:
+        print(f"[NARRATIVE CACHE] WARNING: Failed to store narrative {cache_key}: {e}")
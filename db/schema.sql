@@ -0,0 +1,11 @@
+-- Persistent LLM narrative cache (see llm/narrative_cache.py)
+create table if not exists narrative_cache (
+    cache_key   text primary key,   -- sha1 of (zip, persona, scores hash, model, prompt version)
+    zip_code    text not null,
+    persona     text not null,
+    model       text not null,
+    narrative   text not null,
+    updated_at  timestamptz not null default now()
+);
+
+create index if not exists narrative_cache_zip_idx on narrative_cache (zip_code);
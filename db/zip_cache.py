@@ -21,3 +21,32 @@ def store_zip_data(zip_code: str, data: dict):
         print(f"[CACHE] STORED ZIP {zip_code}")
     except Exception as e:
         print(f"[CACHE] WARNING: Failed to cache ZIP {zip_code}: {e}")
+
+
+def iter_cached_zips(page_size: int = 1000):
+    """
+    Yields (zip_code, data) for every cached ZIP with data, page by page.
+    Used to build the nationwide score snapshot.
+    """
+    start = 0
+    while True:
+        try:
+            res = (
+                supabase.table("zip_cache")
+                .select("zip_code,data")
+                .not_.is_("data", None)
+                .order("zip_code")
+                .range(start, start + page_size - 1)
+                .execute()
+            )
+        except Exception as e:
+            print(f"[CACHE] WARNING: Failed to page cache at offset {start}: {e}")
+            return
+
+        rows = res.data or []
+        for row in rows:
+            yield row["zip_code"], row["data"]
+
+        if len(rows) < page_size:
+            return
+        start += page_size
@@ -0,0 +1,214 @@
+# llm/answer_cache.py
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from config.settings import settings
+
+# Words that change little about what is being asked
+_FILLER = {
+    "a", "an", "the", "please", "can", "could", "you", "tell", "me", "about", "this", "that",
+    "it", "is", "are", "be", "for", "to", "of", "in", "here", "there", "area", "place",
+    "neighborhood", "zip", "code", "what", "s", "like", "really", "very", "do", "does",
+}
+
+# Domain synonyms folded onto one word, so "family friendly?" matches "good for families?"
+_SYNONYMS = {
+    "friendly": "good",
+    "suitable": "good",
+    "kid": "family",
+    "child": "family",
+    "children": "family",
+    "affordability": "affordable",
+    "cheap": "affordable",
+    "safety": "safe",
+    "schooling": "school",
+}
+
+# Words that flip the meaning; they must match exactly, never fuzzily
+_NEGATIONS = {"not", "no", "never", "without", "nor"}
+
+
+def _stem(token: str) -> str:
+    if token.isdigit() or len(token) <= 3:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_question(text: str) -> str:
+    """
+    Lowercase, expand "n't", strip punctuation and filler words, fold
+    plurals and domain synonyms.
+    """
+    text = re.sub(r"n't\b", " not", (text or "").lower())
+    text = re.sub(r"[^a-z0-9 ]+", " ", text)
+    tokens = (_stem(t) for t in text.split() if t not in _FILLER)
+    return " ".join(_SYNONYMS.get(t, t) for t in tokens)
+
+
+def key_tokens(normalized: str) -> frozenset:
+    """
+    Tokens a cached answer must share exactly: numbers (ZIPs, prices, years)
+    and negations. "rent above 2000" never matches "rent above 3000".
+    """
+    return frozenset(t for t in normalized.split() if t in _NEGATIONS or any(c.isdigit() for c in t))
+
+
+@dataclass
+class CachedAnswer:
+    question: str
+    answer: str
+    similarity: float  # 0-100
+
+
+@dataclass
+class _Entry:
+    question: str
+    normalized: str
+    answer: str
+    created: float
+    embedding: np.ndarray | None = None
+    keys: frozenset = frozenset()
+
+
+@dataclass
+class _Context:
+    entries: list[_Entry] = field(default_factory=list)
+
+
+class FuzzyMatcher:
+    """
+    Default matcher: RapidFuzz token-sort ratio over normalized questions.
+    """
+
+    def embed(self, text: str):
+        return None
+
+    def best_match(self, query: str, entries: list[_Entry]) -> tuple[int, float] | None:
+        match = process.extractOne(query, [e.normalized for e in entries], scorer=fuzz.token_sort_ratio)
+        if match is None:
+            return None
+        _, score, index = match
+        return index, float(score)
+
+
+class EmbeddingMatcher:
+    """
+    Cosine similarity (scaled to 0-100) over embeddings from `embed`, any
+    callable mapping a string to a 1-D vector. Catches paraphrases that
+    share few words ("family friendly?" vs "good for kids?").
+    """
+
+    def __init__(self, embed):
+        self._embed = embed
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self._embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def best_match(self, query: str, entries: list[_Entry]) -> tuple[int, float] | None:
+        """
+        (index into `entries`, similarity); entries without an embedding are skipped.
+        """
+        rows = [i for i, e in enumerate(entries) if e.embedding is not None]
+        if not rows:
+            return None
+        sims = np.stack([entries[i].embedding for i in rows]) @ self.embed(query)
+        best = int(np.argmax(sims))
+        return rows[best], float(sims[best]) * 100
+
+
+class AnswerCache:
+    """
+    Chatbot answers grouped by context (zip, persona, scores hash).
+    Contexts are evicted LRU beyond ANSWER_CACHE_MAX_CONTEXTS; each keeps its
+    ANSWER_CACHE_MAX_PER_CONTEXT newest questions, and entries older than
+    ANSWER_CACHE_TTL_SECONDS are dropped.
+    """
+
+    def __init__(self, matcher=None):
+        self.matcher = matcher or FuzzyMatcher()
+        self._contexts: OrderedDict[str, _Context] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live_entries(self, context: _Context) -> list[_Entry]:
+        cutoff = time.time() - settings.ANSWER_CACHE_TTL_SECONDS
+        context.entries = [e for e in context.entries if e.created >= cutoff]
+        return context.entries
+
+    def lookup(self, context_key: str, question: str) -> CachedAnswer | None:
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+
+        with self._lock:
+            context = self._contexts.get(context_key)
+            if context is None:
+                return None
+            self._contexts.move_to_end(context_key)
+            keys = key_tokens(normalized)
+            entries = [e for e in self._live_entries(context) if e.keys == keys]
+
+        if not entries:
+            return None
+
+        try:
+            match = self.matcher.best_match(normalized, entries)
+        except Exception as e:
+            print(f"[ANSWER CACHE] WARNING: Matching failed, treating as a miss: {e}")
+            return None
+        if match is None or match[1] < settings.ANSWER_CACHE_THRESHOLD:
+            return None
+
+        entry = entries[match[0]]
+        return CachedAnswer(question=entry.question, answer=entry.answer, similarity=match[1])
+
+    def store(self, context_key: str, question: str, answer: str):
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+
+        try:
+            embedding = self.matcher.embed(normalized)
+        except Exception as e:
+            print(f"[ANSWER CACHE] WARNING: Embedding failed, answer not cached: {e}")
+            return
+
+        entry = _Entry(question, normalized, answer, time.time(), embedding, key_tokens(normalized))
+
+        with self._lock:
+            context = self._contexts.setdefault(context_key, _Context())
+            self._contexts.move_to_end(context_key)
+            entries = [e for e in self._live_entries(context) if e.normalized != normalized]
+            entries.append(entry)
+            context.entries = entries[-settings.ANSWER_CACHE_MAX_PER_CONTEXT:]
+
+            while len(self._contexts) > settings.ANSWER_CACHE_MAX_CONTEXTS:
+                self._contexts.popitem(last=False)
+
+
+_answer_cache = AnswerCache()
+
+
+def get_answer_cache() -> AnswerCache:
+    return _answer_cache
+
+
+def set_question_matcher(matcher):
+    """
+    Swaps the matcher (e.g. EmbeddingMatcher(my_embed_fn)); clears cached answers
+    since stored entries may lack the new matcher's embeddings.
+    """
+    global _answer_cache
+    _answer_cache = AnswerCache(matcher)
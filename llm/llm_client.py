@@ -1,18 +1,206 @@
 # llm/llm_client.py
 
-from openai import OpenAI
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
 from config.settings import settings
+from llm.metrics import record_call
+from llm.providers import LLMProvider, LLMResponse, estimate_tokens, make_provider, provider_class
+
+_DONE = object()
+
+
+class LLMTimeout(RuntimeError):
+    pass
+
+
+class LLMPool:
+    """
+    Primary provider with optional failover.
+    Every call has a deadline; when the primary errors or misses it, the
+    next provider is tried with the same deadline.
+    """
+
+    def __init__(self, providers: list[LLMProvider], timeout: float):
+        self.providers = providers
+        self.timeout = timeout
+
+    @property
+    def primary(self) -> LLMProvider:
+        return self.providers[0]
+
+    def complete(
+        self, messages: list[dict], timeout: float | None = None, site: str = "other", persona: str | None = None
+    ) -> LLMResponse:
+        """
+        `site` and `persona` only tag the call in llm.metrics.
+        """
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        last_error = None
+
+        for provider in self.providers:
+            future = _submit(provider, messages, timeout)
+            try:
+                response = future.result(timeout=timeout)
+            except FutureTimeout:
+                last_error = LLMTimeout(f"{provider.name} did not answer within {timeout:g}s")
+            except Exception as e:
+                last_error = e
+            else:
+                record_call(
+                    site, persona, response.provider, response.model, time.perf_counter() - started,
+                    response.prompt_tokens, response.completion_tokens,
+                )
+                return response
+            print(f"[LLM] WARNING: {provider.name} failed ({last_error}); trying next provider")
+
+        record_call(site, persona, self.primary.name, self.primary.model, time.perf_counter() - started, ok=False)
+        raise last_error or RuntimeError("No LLM providers configured")
+
+    def stream(
+        self, messages: list[dict], timeout: float | None = None, site: str = "other", persona: str | None = None
+    ):
+        """
+        Yields text chunks. Failover happens only before the first chunk;
+        after that a stalled stream raises LLMTimeout.
+        Streams report no usage, so tokens are estimated from the text.
+        """
+        started = time.perf_counter()
+        used = {}
+        parts = []
+        ok = False
+
+        try:
+            for chunk in self._stream(messages, timeout or self.timeout, used):
+                if not parts:
+                    used["first_chunk"] = time.perf_counter() - started
+                parts.append(chunk)
+                yield chunk
+            ok = True
+        except GeneratorExit:
+            ok = True  # consumer stopped reading
+            raise
+        finally:
+            provider = used.get("provider", self.primary)
+            text = "".join(parts)
+            record_call(
+                site, persona, provider.name, provider.model, time.perf_counter() - started,
+                estimate_tokens("".join(m["content"] for m in messages)),
+                estimate_tokens(text) if text else 0,
+                ok=ok, streamed=True, first_chunk=used.get("first_chunk"),
+            )
+
+    def _stream(self, messages: list[dict], timeout: float, used: dict):
+        last_error = None
+
+        for provider in self.providers:
+            chunks = queue.Queue()
+            threading.Thread(
+                target=_pump, args=(provider, messages, timeout, chunks), daemon=True, name="llm-stream"
+            ).start()
+
+            try:
+                first = chunks.get(timeout=timeout)
+            except queue.Empty:
+                last_error = LLMTimeout(f"{provider.name} sent nothing within {timeout:g}s")
+                print(f"[LLM] WARNING: {last_error}; trying next provider")
+                continue
+
+            if isinstance(first, Exception):
+                last_error = first
+                print(f"[LLM] WARNING: {provider.name} failed ({first}); trying next provider")
+                continue
+
+            used["provider"] = provider
+            item = first
+            while item is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                try:
+                    item = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    raise LLMTimeout(f"{provider.name} stream stalled for {timeout:g}s")
+            return
+
+        raise last_error or RuntimeError("No LLM providers configured")
+
+
+def _submit(provider: LLMProvider, messages: list[dict], timeout: float) -> Future:
+    """
+    Runs one call on its own daemon thread. A call that outlives its deadline
+    only holds that thread; a shared pool would let a hung primary use up the
+    workers the fallback needs.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(provider.complete(messages, timeout))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True, name="llm-call").start()
+    return future
+
+
+def _pump(provider: LLMProvider, messages: list[dict], timeout: float, chunks: queue.Queue):
+    try:
+        for chunk in provider.stream(messages, timeout):
+            chunks.put(chunk)
+        chunks.put(_DONE)
+    except Exception as e:
+        chunks.put(e)
+
 
 _client = None
+_client_lock = threading.Lock()
+
 
-def get_llm_client():
+def get_llm_client() -> LLMPool:
+    """
+    Process-wide pool built from LLM_PROVIDER and LLM_FALLBACK_PROVIDER.
+    Providers are created once so their HTTP connections are reused.
+    """
     global _client
 
-    if _client:
+    with _client_lock:
+        if _client:
+            return _client
+
+        names = [settings.LLM_PROVIDER]
+        if settings.LLM_FALLBACK_PROVIDER and settings.LLM_FALLBACK_PROVIDER != settings.LLM_PROVIDER:
+            names.append(settings.LLM_FALLBACK_PROVIDER)
+
+        providers = []
+        for name in names:
+            try:
+                providers.append(make_provider(name))
+            except Exception as e:
+                print(f"[LLM] WARNING: Provider {name} unavailable: {e}")
+
+        if not providers:
+            raise RuntimeError(f"No usable LLM provider among: {', '.join(names)}")
+
+        _client = LLMPool(providers, settings.LLM_TIMEOUT_SECONDS)
         return _client
 
-    if not settings.OPENAI_API_KEY:
-        raise RuntimeError("OPENAI_API_KEY missing in .env file.")
 
-    _client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    return _client
+def get_model_name() -> str:
+    """
+    Provider/model identifier, used to key cached completions.
+    Read from settings, so cached text can be looked up without building
+    a provider (or having an API key).
+    """
+    provider = provider_class(settings.LLM_PROVIDER)
+    return f"{provider.name}:{provider.default_model()}"
+
+
+def chat_messages(system: str, prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
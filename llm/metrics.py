@@ -0,0 +1,168 @@
+# llm/metrics.py
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+
+from config.settings import DATA_DIR, settings
+from llm.providers import provider_class, response_cost
+
+# Append-only JSON-lines log of every call (when LLM_METRICS_LOG is on)
+LLM_CALL_LOG = DATA_DIR / "llm_calls.jsonl"
+
+
+@dataclass
+class LLMCall:
+    ts: float                   # unix time the call finished
+    site: str                   # "narrative", "chatbot", ...
+    persona: str | None
+    provider: str
+    model: str
+    latency: float              # seconds, whole call including failover
+    first_chunk: float | None   # seconds to first streamed chunk
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float                 # USD, from MODEL_PRICES
+    cached: bool = False
+    ok: bool = True
+    streamed: bool = False
+
+    @property
+    def day(self) -> str:
+        return datetime.fromtimestamp(self.ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+class LLMMetrics:
+    """
+    In-process record of recent LLM calls (bounded by LLM_METRICS_MAX_RECORDS)
+    with per-site/persona/model aggregates. Shared by all sessions.
+    """
+
+    def __init__(self, maxlen: int):
+        self._calls: deque[LLMCall] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, call: LLMCall):
+        with self._lock:
+            self._calls.append(call)
+
+        if settings.LLM_METRICS_LOG:
+            try:
+                LLM_CALL_LOG.parent.mkdir(parents=True, exist_ok=True)
+                with open(LLM_CALL_LOG, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(call)) + "\n")
+            except Exception as e:
+                print(f"[LLM METRICS] WARNING: Could not append to {LLM_CALL_LOG}: {e}")
+
+    def calls(self) -> list[LLMCall]:
+        with self._lock:
+            return list(self._calls)
+
+    def summary(self, group_by: tuple[str, ...] = ("site",)) -> list[dict]:
+        """
+        One row per group: calls, cache hits, errors, p50/p95 latency of real
+        (uncached, successful) calls, tokens and cost.
+        """
+        groups: dict[tuple, list[LLMCall]] = {}
+        for call in self.calls():
+            groups.setdefault(tuple(getattr(call, g) for g in group_by), []).append(call)
+
+        rows = []
+        for key, calls in sorted(groups.items(), key=lambda kv: str(kv[0])):
+            live = [c for c in calls if not c.cached and c.ok]
+            latencies = np.array([c.latency for c in live]) if live else None
+            rows.append({
+                **dict(zip(group_by, key)),
+                "calls": len(calls),
+                "cache_hits": sum(c.cached for c in calls),
+                "errors": sum(not c.ok for c in calls),
+                "p50_latency_s": round(float(np.percentile(latencies, 50)), 3) if live else None,
+                "p95_latency_s": round(float(np.percentile(latencies, 95)), 3) if live else None,
+                "prompt_tokens": sum(c.prompt_tokens for c in calls),
+                "completion_tokens": sum(c.completion_tokens for c in calls),
+                "cost_usd": round(sum(c.cost for c in calls), 6),
+            })
+        return rows
+
+    def daily_spend(self) -> list[dict]:
+        """
+        Tokens and cost per UTC day and call site.
+        """
+        return self.summary(group_by=("day", "site"))
+
+    def export_json(self, path=None) -> str:
+        """
+        Writes the recorded calls plus aggregates as one JSON document.
+        Returns the JSON text; also saved to `path` when given.
+        """
+        payload = json.dumps(
+            {
+                "exported_at": time.time(),
+                "summary": self.summary(("site", "persona", "model")),
+                "daily": self.daily_spend(),
+                "calls": [asdict(c) for c in self.calls()],
+            },
+            indent=2,
+        )
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(payload)
+        return payload
+
+
+llm_metrics = LLMMetrics(settings.LLM_METRICS_MAX_RECORDS)
+
+
+def record_call(
+    site: str,
+    persona: str | None,
+    provider: str,
+    model: str,
+    latency: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    ok: bool = True,
+    streamed: bool = False,
+    first_chunk: float | None = None,
+):
+    llm_metrics.record(LLMCall(
+        ts=time.time(),
+        site=site,
+        persona=persona,
+        provider=provider,
+        model=model,
+        latency=latency,
+        first_chunk=first_chunk,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        cost=response_cost(model, prompt_tokens, completion_tokens),
+        ok=ok,
+        streamed=streamed,
+    ))
+
+
+def record_cache_hit(site: str, persona: str | None):
+    """
+    A request answered from a cache: no tokens, no cost.
+    Tagged with the configured provider's model, the same name live calls
+    record, so hits and calls group together per model.
+    """
+    model = provider_class(settings.LLM_PROVIDER).default_model()
+    llm_metrics.record(LLMCall(
+        ts=time.time(),
+        site=site,
+        persona=persona,
+        provider="cache",
+        model=model,
+        latency=0.0,
+        first_chunk=None,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cost=0.0,
+        cached=True,
+    ))
@@ -0,0 +1,288 @@
+# llm/narrative_cache.py
+
+import hashlib
+import json
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from config.constants import METRIC_NAMES
+from config.settings import settings
+from db.narrative_cache import get_cached_narrative, store_narrative
+from llm.llm_client import get_model_name
+from llm.metrics import record_cache_hit
+from llm.narrative_generator import (
+    MULTI_PERSONA_PROMPT_VERSION,
+    NARRATIVE_PROMPT_VERSION,
+    generate_narrative,
+    generate_persona_narratives,
+    stream_narrative,
+)
+from llm.narrative_templates import template_narrative
+
+_lru: OrderedDict = OrderedDict()
+_lock = threading.Lock()
+
+_DONE = object()
+
+
+def scores_hash(scores: dict) -> str:
+    """
+    Hash of the eight category scores. OverallCivicScore is left out: it only
+    reflects the slider weights and never reaches the narrative prompt.
+    """
+    metrics = {metric: scores[metric] for metric in METRIC_NAMES if metric in scores}
+    payload = json.dumps(metrics, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def narrative_key(
+    zip_code: str,
+    persona: str | None,
+    scores: dict,
+    model: str | None = None,
+    prompt_version=NARRATIVE_PROMPT_VERSION,
+) -> str:
+    """
+    Cache key over (zip, persona, scores hash, model, prompt version).
+    """
+    parts = [zip_code, persona or "", scores_hash(scores), model or get_model_name(), str(prompt_version)]
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _lru_get(key: str):
+    with _lock:
+        value = _lru.get(key)
+        if value is not None:
+            _lru.move_to_end(key)
+        return value
+
+
+def _lru_put(key: str, value: str):
+    with _lock:
+        _lru[key] = value
+        _lru.move_to_end(key)
+        while len(_lru) > settings.NARRATIVE_CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def lookup_narrative(
+    zip_code: str, scores: dict, persona: str | None, prompt_version=NARRATIVE_PROMPT_VERSION
+) -> str | None:
+    """
+    Cached narrative from the in-process LRU, then the persistent store.
+    """
+    key = narrative_key(zip_code, persona, scores, prompt_version=prompt_version)
+
+    narrative = _lru_get(key)
+    if narrative is not None:
+        return narrative
+
+    narrative = get_cached_narrative(key)
+    if narrative is not None:
+        _lru_put(key, narrative)
+    return narrative
+
+
+def remember_narrative(
+    zip_code: str, scores: dict, persona: str | None, narrative: str, prompt_version=NARRATIVE_PROMPT_VERSION
+):
+    """
+    Stores a finished narrative in both cache layers.
+    """
+    if not narrative:
+        return
+    model = get_model_name()
+    key = narrative_key(zip_code, persona, scores, model, prompt_version)
+    _lru_put(key, narrative)
+    store_narrative(key, zip_code, persona or "", model, narrative)
+
+
+def lookup_persona_section(zip_code: str, scores: dict, persona: str) -> str | None:
+    """
+    Multi-persona mode lookup: a section from a batched answer, else a
+    narrative from the single-persona prompt (used when the batch failed).
+    """
+    narrative = lookup_narrative(zip_code, scores, persona, MULTI_PERSONA_PROMPT_VERSION)
+    if narrative is None:
+        narrative = lookup_narrative(zip_code, scores, persona)
+    return narrative
+
+
+def cached_narrative(zip_code: str, scores: dict, persona: str | None) -> str:
+    """
+    generate_narrative behind the two cache layers.
+    Repeat views (any rerun, any session) return instantly.
+    """
+    narrative = lookup_narrative(zip_code, scores, persona)
+    if narrative is not None:
+        record_cache_hit("narrative", persona)
+        return narrative
+
+    narrative = generate_narrative(zip_code, scores, persona)
+    remember_narrative(zip_code, scores, persona, narrative)
+    return narrative
+
+
+def cached_persona_narratives(zip_code: str, scores: dict, personas: list[str]) -> dict[str, str]:
+    """
+    {persona: narrative} for every persona. Missing ones are generated together
+    in one LLM request and cached individually (under the multi-persona prompt
+    version), so later persona switches hit the cache. Personas the answer
+    left out are absent from the result.
+    """
+    narratives, missing = {}, []
+    for persona in personas:
+        narrative = lookup_persona_section(zip_code, scores, persona)
+        if narrative is None:
+            missing.append(persona)
+        else:
+            narratives[persona] = narrative
+
+    if len(missing) == 1:
+        narratives[missing[0]] = cached_narrative(zip_code, scores, missing[0])
+    elif missing:
+        for persona, narrative in generate_persona_narratives(zip_code, scores, missing).items():
+            remember_narrative(zip_code, scores, persona, narrative, MULTI_PERSONA_PROMPT_VERSION)
+            narratives[persona] = narrative
+
+    return narratives
+
+
+class DeadlineNarrative:
+    """
+    Iterable for st.write_stream with a capped wait: the app's one path for
+    showing a narrative. Streams the cached or LLM narrative; if nothing
+    arrives within the deadline (cache lookup included) or the provider fails,
+    yields template_narrative() instead.
+    The LLM keeps running in the background and is cached when it finishes;
+    `pending` then holds a future of its full text so the page can swap it in.
+    Cache hits set `from_cache` but are not recorded in llm.metrics: iteration
+    repeats on every rerun, so the caller records one hit per view.
+    """
+
+    def __init__(
+        self,
+        zip_code: str,
+        scores: dict,
+        persona: str | None,
+        deadline: float | None = None,
+        personas: list[str] | None = None,
+    ):
+        """
+        With `personas`, a miss generates all of them in one request
+        (cached_persona_narratives) and shows this persona's section.
+        """
+        self.zip_code = zip_code
+        self.scores = scores
+        self.persona = persona
+        self.personas = personas
+        self.deadline = settings.NARRATIVE_DEADLINE_SECONDS if deadline is None else deadline
+        self.pending: Future | None = None
+        self.from_cache = False
+
+    @property
+    def multi_persona(self) -> bool:
+        return bool(self.personas) and len(self.personas) > 1 and self.persona in self.personas
+
+    def _lookup(self) -> str | None:
+        try:
+            if self.multi_persona:
+                return lookup_persona_section(self.zip_code, self.scores, self.persona)
+            return lookup_narrative(self.zip_code, self.scores, self.persona)
+        except Exception as e:
+            print(f"[NARRATIVE] WARNING: Cache lookup failed for {self.zip_code}: {e}")
+            return None
+
+    def _pump(self, chunks: queue.Queue, result: Future):
+        narrative = self._lookup()
+        if narrative is not None:
+            self.from_cache = True
+            result.set_result(narrative)
+            chunks.put(narrative)
+            chunks.put(_DONE)
+            return
+
+        if self.multi_persona:
+            try:
+                text = cached_persona_narratives(self.zip_code, self.scores, self.personas).get(self.persona)
+            except Exception as e:
+                print(f"[NARRATIVE] WARNING: Multi-persona request failed for {self.zip_code}: {e}")
+                text = None
+            if text:
+                result.set_result(text)
+                chunks.put(text)
+                chunks.put(_DONE)
+                return
+
+        parts = []
+        try:
+            for chunk in stream_narrative(self.zip_code, self.scores, self.persona):
+                parts.append(chunk)
+                chunks.put(chunk)
+        except Exception as e:
+            result.set_exception(e)
+            chunks.put(e)
+            return
+
+        text = "".join(parts)
+        remember_narrative(self.zip_code, self.scores, self.persona, text)
+        result.set_result(text)
+        chunks.put(_DONE)
+
+    def __iter__(self):
+        # The deadline starts before the cache lookup, so a slow Supabase
+        # round trip falls back to the template like a slow LLM does
+        chunks, result = queue.Queue(), Future()
+        threading.Thread(target=self._pump, args=(chunks, result), daemon=True, name="narrative-stream").start()
+
+        try:
+            item = chunks.get(timeout=self.deadline)
+        except queue.Empty:
+            item = None
+            self.pending = result
+
+        if item is None or isinstance(item, Exception) or item is _DONE:
+            if isinstance(item, Exception):
+                print(f"[NARRATIVE] WARNING: LLM failed for {self.zip_code}, using template: {item}")
+            yield template_narrative(self.zip_code, self.scores, self.persona)
+            return
+
+        while item is not _DONE:
+            if isinstance(item, Exception):
+                # Part of the text is already on screen: finish with the template
+                print(f"[NARRATIVE] WARNING: LLM stream failed for {self.zip_code}, using template: {item}")
+                yield "\n\n---\n\n" + template_narrative(self.zip_code, self.scores, self.persona)
+                return
+            yield item
+            item = chunks.get()
+
+
+def prewarm_narratives(items, personas: list[str]) -> int:
+    """
+    Generates missing narratives for popular ZIPs ahead of time.
+    `items` yields (zip_code, scores). Returns how many were generated.
+    With NARRATIVE_MULTI_PERSONA each ZIP takes a single request.
+    """
+    generated = 0
+    for zip_code, scores in items:
+        if settings.NARRATIVE_MULTI_PERSONA:
+            missing = [p for p in personas if lookup_persona_section(zip_code, scores, p) is None]
+            if not missing:
+                continue
+            try:
+                generated += len(set(missing) & set(cached_persona_narratives(zip_code, scores, missing)))
+            except Exception as e:
+                print(f"[NARRATIVE CACHE] WARNING: Prewarm failed for {zip_code}: {e}")
+            continue
+
+        for persona in personas:
+            if lookup_narrative(zip_code, scores, persona) is not None:
+                continue
+            try:
+                cached_narrative(zip_code, scores, persona)
+                generated += 1
+            except Exception as e:
+                print(f"[NARRATIVE CACHE] WARNING: Prewarm failed for {zip_code}/{persona}: {e}")
+    return generated
@@ -1,14 +1,24 @@
 # llm/narrative_generator.py
 
-from config.settings import settings
-from llm.llm_client import get_llm_client
+import json
+import re
+
+from llm.llm_client import chat_messages, get_llm_client
 from llm.feature_summary import build_feature_summary
 
+# Bump whenever the prompt below changes so cached narratives are not reused
+NARRATIVE_PROMPT_VERSION = 1
+
+# Same for build_multi_persona_prompt; its sections are cached under their own keys
+MULTI_PERSONA_PROMPT_VERSION = "multi-1"
+
+NARRATIVE_SYSTEM_PROMPT = "You are a civic intelligence analyst."
+
 
-def generate_narrative(zip_code: str, scores: dict, persona: str | None):
+def build_narrative_prompt(zip_code: str, scores: dict, persona: str | None) -> str:
     features = build_feature_summary(scores)
 
-    prompt = f"""
+    return f"""
     Provide an analytical yet readable civic explanation for ZIP {zip_code}.
     Focus on safety, health, education, economy, affordability, broadband, environment, and accessibility.
 
@@ -20,22 +30,81 @@ def generate_narrative(zip_code: str, scores: dict, persona: str | None):
     Do NOT repeat numeric values excessively—explain what they mean.
     """
 
-    # ==========================
-    # LLM Client (Gemini or OpenAI)
-    # ==========================
-    client = get_llm_client()
 
-    # GEMINI
-    if hasattr(client, "generate_content"):
-        response = client.generate_content(prompt)
-        return response.text
+def generate_narrative(zip_code: str, scores: dict, persona: str | None) -> str:
+    """
+    LLM narrative for a ZIP.
+    """
+    prompt = build_narrative_prompt(zip_code, scores, persona)
+    messages = chat_messages(NARRATIVE_SYSTEM_PROMPT, prompt)
+    return get_llm_client().complete(messages, site="narrative", persona=persona).text
+
+
+def stream_narrative(zip_code: str, scores: dict, persona: str | None):
+    """
+    Same narrative as generate_narrative, yielded chunk by chunk.
+    """
+    prompt = build_narrative_prompt(zip_code, scores, persona)
+    yield from get_llm_client().stream(
+        chat_messages(NARRATIVE_SYSTEM_PROMPT, prompt), site="narrative", persona=persona
+    )
+
+
+def build_multi_persona_prompt(zip_code: str, scores: dict, personas: list[str]) -> str:
+    features = build_feature_summary(scores)
+    keys = ", ".join(json.dumps(p) for p in personas)
+
+    return f"""
+    Provide an analytical yet readable civic explanation for ZIP {zip_code},
+    written separately for each of these persona types: {keys}.
+    Focus on safety, health, education, economy, affordability, broadband, environment, and accessibility.
+
+    **Civic Performance Summary**
+    {features}
+
+    For each persona, provide insights on livability, resident experience, and opportunities
+    from that persona's point of view.
+    Do NOT repeat numeric values excessively—explain what they mean.
+
+    Answer with a single JSON object and nothing else. Use exactly these keys: {keys}.
+    Each value is that persona's narrative as a Markdown string.
+    """
+
+
+def parse_persona_sections(text: str, personas: list[str]) -> dict[str, str]:
+    """
+    {persona: narrative} from a JSON answer. Tolerates code fences and text
+    around the object; personas missing from the answer are left out.
+    """
+    match = re.search(r"\{.*\}", text or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        sections = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(sections, dict):
+        return {}
+
+    return {
+        persona: sections[persona].strip()
+        for persona in personas
+        if isinstance(sections.get(persona), str) and sections[persona].strip()
+    }
+
 
-    # OPENAI
-    response = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=[
-            {"role": "system", "content": "You are a civic intelligence analyst."},
-            {"role": "user", "content": prompt},
-        ],
+def generate_persona_narratives(zip_code: str, scores: dict, personas: list[str]) -> dict[str, str]:
+    """
+    Narratives for several personas from one LLM request, so the shared
+    score context is sent (and billed) once.
+    """
+    prompt = build_multi_persona_prompt(zip_code, scores, personas)
+    response = get_llm_client().complete(
+        chat_messages(NARRATIVE_SYSTEM_PROMPT, prompt), site="narrative_multi", persona=",".join(personas)
     )
-    return response.choices[0].message.content
+
+    sections = parse_persona_sections(response.text, personas)
+    missing = [p for p in personas if p not in sections]
+    if missing:
+        print(f"[NARRATIVE] WARNING: Multi-persona answer for {zip_code} lacked: {', '.join(missing)}")
+    return sections
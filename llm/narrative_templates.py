@@ -0,0 +1,84 @@
+# llm/narrative_templates.py
+
+from llm.feature_summary import describe_metric
+
+# Readable names for the metric keys
+METRIC_LABELS = {
+    "Safety": "public safety",
+    "Health": "health outcomes",
+    "Education": "education",
+    "EconomicOpportunity": "economic opportunity",
+    "HousingAffordability": "housing affordability",
+    "DigitalAccess": "broadband and digital access",
+    "Environment": "environmental quality",
+    "Accessibility": "access to everyday amenities",
+}
+
+# Per-persona framing: opening line and the metrics that persona cares about most
+PERSONA_TEMPLATES = {
+    "General": {
+        "intro": "Here is an overview of civic conditions in ZIP {zip_code}.",
+        "focus": ["Safety", "EconomicOpportunity", "HousingAffordability"],
+        "closing": "Compare nearby ZIPs to see how the area stands out locally.",
+    },
+    "Family": {
+        "intro": "For families considering ZIP {zip_code}, the picture looks like this.",
+        "focus": ["Safety", "Education", "Health", "HousingAffordability"],
+        "closing": "Families should visit schools and parks in person to round out these indicators.",
+    },
+    "Business": {
+        "intro": "From a business perspective, ZIP {zip_code} shows the following profile.",
+        "focus": ["EconomicOpportunity", "DigitalAccess", "Education", "Accessibility"],
+        "closing": "Local workforce and commercial rents are worth checking alongside these scores.",
+    },
+    "Government Planner": {
+        "intro": "For planning purposes, ZIP {zip_code} presents these priorities.",
+        "focus": ["HousingAffordability", "Accessibility", "Environment", "Health"],
+        "closing": "The weakest areas above are the natural candidates for targeted investment.",
+    },
+    "NGO": {
+        "intro": "For community organizations working in ZIP {zip_code}, these needs stand out.",
+        "focus": ["Health", "HousingAffordability", "EconomicOpportunity", "DigitalAccess"],
+        "closing": "Partnering on the lowest-scoring areas would reach residents with the most need.",
+    },
+}
+
+
+def _grade(name: str, score: float) -> str:
+    # describe_metric returns "Name: score/100 (Grade)"
+    return describe_metric(name, score).rsplit("(", 1)[-1].rstrip(")")
+
+
+def template_narrative(zip_code: str, scores: dict, persona: str | None) -> str:
+    """
+    Deterministic narrative built from the metric grades, used when the LLM
+    misses its deadline. Same inputs always give the same text.
+    """
+    template = PERSONA_TEMPLATES.get(persona or "General", PERSONA_TEMPLATES["General"])
+    metrics = {k: v for k, v in scores.items() if k != "OverallCivicScore" and v is not None}
+
+    lines = [template["intro"].format(zip_code=zip_code)]
+
+    overall = scores.get("OverallCivicScore")
+    if overall is not None:
+        lines.append(
+            f"The overall civic score is {overall:.1f} out of 100, which rates as "
+            f"{_grade('Overall', overall).lower()}."
+        )
+
+    focus = [m for m in template["focus"] if m in metrics]
+    if focus:
+        lines.append("")
+        lines.append("**Key areas for this perspective**")
+        for metric in focus:
+            lines.append(f"- {METRIC_LABELS.get(metric, metric).capitalize()}: {_grade(metric, metrics[metric]).lower()}")
+
+    if metrics:
+        ranked = sorted(metrics, key=metrics.get, reverse=True)
+        strongest = [METRIC_LABELS.get(m, m) for m in ranked[:2]]
+        weakest = [METRIC_LABELS.get(m, m) for m in ranked[-2:][::-1]]
+        lines.append("")
+        lines.append(f"The area is strongest in {' and '.join(strongest)}, and weakest in {' and '.join(weakest)}.")
+
+    lines.append(template["closing"])
+    return "\n".join(lines)
@@ -0,0 +1,202 @@
+# llm/providers.py
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from config.constants import MODEL_PRICES
+from config.settings import settings
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    provider: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cost(self) -> float:
+        return response_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) when a provider reports none."""
+    return max(1, len(text or "") // 4)
+
+
+def response_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    USD cost of one call from MODEL_PRICES; unknown models cost 0.
+    """
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _messages_to_prompt(messages: list[dict]) -> str:
+    return "\n\n".join(m["content"] for m in messages)
+
+
+class LLMProvider(ABC):
+    """
+    One upstream model. complete() returns an LLMResponse; stream() yields text chunks.
+    Implementations create their HTTP client once and reuse its connections.
+    """
+    name = "base"
+
+    def __init__(self, model: str | None = None):
+        self.model = model or self.default_model()
+
+    @classmethod
+    @abstractmethod
+    def default_model(cls) -> str:
+        """Model used when none is given, from settings."""
+
+    @abstractmethod
+    def complete(self, messages: list[dict], timeout: float) -> LLMResponse:
+        ...
+
+    def stream(self, messages: list[dict], timeout: float):
+        yield self.complete(messages, timeout).text
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+
+    @classmethod
+    def default_model(cls):
+        return settings.OPENAI_MODEL
+
+    def __init__(self, model: str | None = None):
+        super().__init__(model)
+
+        from openai import OpenAI
+
+        if not settings.OPENAI_API_KEY:
+            raise RuntimeError("OPENAI_API_KEY missing in .env file.")
+        # Retries are handled by the pool's failover, not inside the SDK
+        self._client = OpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+
+    def complete(self, messages, timeout):
+        response = self._client.chat.completions.create(model=self.model, messages=messages, timeout=timeout)
+        usage = getattr(response, "usage", None)
+        return LLMResponse(
+            text=response.choices[0].message.content,
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        )
+
+    def stream(self, messages, timeout):
+        stream = self._client.chat.completions.create(
+            model=self.model, messages=messages, stream=True, timeout=timeout
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    @classmethod
+    def default_model(cls):
+        return settings.GEMINI_MODEL
+
+    def __init__(self, model: str | None = None):
+        super().__init__(model)
+
+        import google.generativeai as genai
+
+        if not settings.GEMINI_API_KEY:
+            raise RuntimeError("GEMINI_API_KEY missing in .env file.")
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self._model = genai.GenerativeModel(self.model)
+
+    def complete(self, messages, timeout):
+        response = self._model.generate_content(
+            _messages_to_prompt(messages), request_options={"timeout": timeout}
+        )
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text,
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            completion_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+        )
+
+    def stream(self, messages, timeout):
+        response = self._model.generate_content(
+            _messages_to_prompt(messages), stream=True, request_options={"timeout": timeout}
+        )
+        for chunk in response:
+            if getattr(chunk, "text", None):
+                yield chunk.text
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic offline provider for tests and benchmarks.
+    The same messages always produce the same text; no network access.
+    """
+    name = "stub"
+
+    @classmethod
+    def default_model(cls):
+        return "stub-1"
+
+    def __init__(self, model: str | None = None, latency: float | None = None):
+        super().__init__(model)
+        self.latency = settings.LLM_STUB_LATENCY if latency is None else latency
+
+    def _text(self, messages: list[dict]) -> str:
+        prompt = _messages_to_prompt(messages)
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        question = messages[-1]["content"].strip().splitlines()[0][:160] if messages else ""
+        return (
+            f"[stub {digest}] Offline response for: {question}\n\n"
+            "This text is generated locally so the app can run without an LLM provider."
+        )
+
+    def complete(self, messages, timeout):
+        if self.latency:
+            time.sleep(self.latency)
+        text = self._text(messages)
+        return LLMResponse(
+            text=text,
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=estimate_tokens(_messages_to_prompt(messages)),
+            completion_tokens=estimate_tokens(text),
+        )
+
+    def stream(self, messages, timeout):
+        words = self.complete(messages, timeout).text.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == 0 else " " + word
+
+
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "gemini": GeminiProvider,
+    "stub": StubProvider,
+}
+
+
+def provider_class(name: str) -> type[LLMProvider]:
+    try:
+        return PROVIDERS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider {name!r} (expected one of {', '.join(PROVIDERS)})")
+
+
+def make_provider(name: str) -> LLMProvider:
+    return provider_class(name)()
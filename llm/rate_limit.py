@@ -0,0 +1,66 @@
+# llm/rate_limit.py
+
+import threading
+import time
+
+
+class RateGovernor:
+    """
+    Token-bucket limiter for provider quotas: requests per minute and tokens
+    per minute. acquire() blocks until both buckets can cover the call;
+    settle() corrects the token bucket once the real usage is known.
+    A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.rpm = requests_per_minute
+        self.tpm = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.rpm and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.rpm)
+        if self.tpm:
+            # A single call larger than the whole bucket waits for a full bucket
+            needed = min(tokens, self.tpm)
+            if self._tokens < needed:
+                wait = max(wait, (needed - self._tokens) * 60 / self.tpm)
+        return wait
+
+    def acquire(self, tokens: int = 0):
+        with self._cond:
+            while True:
+                self._refill()
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                self._cond.wait(wait)
+
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+    def settle(self, estimated: int, actual: int):
+        """
+        Refunds (or charges) the difference between the estimate passed to
+        acquire() and the tokens the call really used.
+        """
+        if not self.tpm:
+            return
+        with self._cond:
+            self._tokens = min(self.tpm, self._tokens + estimated - actual)
+            self._cond.notify_all()
@@ -0,0 +1,165 @@
+import sys, json, time, random
+from pathlib import Path
+
+# --- allow imports of app modules ---
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from config.constants import METRIC_NAMES
+from config.settings import DATA_DIR
+from visualizations.radial_chart import plot_radial
+
+RESULTS_PATH = DATA_DIR / "benchmarks" / "radial_chart.json"
+
+
+def legacy_plot_radial(scores: dict):
+    """
+    The previous 2x4 make_subplots implementation (32 traces), kept for comparison.
+    """
+    # Remove OverallCivicScore because we plot only metrics
+    data = {k: v for k, v in scores.items() if k != "OverallCivicScore"}
+
+    labels = list(data.keys())
+    values = list(data.values())
+
+    # Create subplots in a 2x4 grid
+    fig = make_subplots(
+        rows=2, cols=4,
+        subplot_titles=labels,
+        vertical_spacing=0.15,
+        horizontal_spacing=0.1
+    )
+
+    for i, (label, value) in enumerate(zip(labels, values)):
+        row = (i // 4) + 1
+        col = (i % 4) + 1
+        
+        # Add background bars first (they'll be behind the value bar)
+        # White background (0-33)
+        fig.add_trace(
+            go.Bar(
+                x=[label],
+                y=[33],
+                orientation='v',
+                marker=dict(color='#FFFFFF', line=dict(width=0)),
+                showlegend=False,
+                hoverinfo='skip'
+            ),
+            row=row, col=col
+        )
+        
+        # Powder blue background (33-66)
+        fig.add_trace(
+            go.Bar(
+                x=[label],
+                y=[33],  # Height of this segment
+                base=33,
+                orientation='v',
+                marker=dict(color='#B0E0E6', line=dict(width=0)),
+                showlegend=False,
+                hoverinfo='skip'
+            ),
+            row=row, col=col
+        )
+        
+        # Dark blue background (66-100)
+        fig.add_trace(
+            go.Bar(
+                x=[label],
+                y=[34],  # Height of this segment (100-66)
+                base=66,
+                orientation='v',
+                marker=dict(color='#00008B', line=dict(width=0)),
+                showlegend=False,
+                hoverinfo='skip'
+            ),
+            row=row, col=col
+        )
+        
+        # Add the actual value bar on top (green indicator)
+        fig.add_trace(
+            go.Bar(
+                x=[label],
+                y=[value],
+                orientation='v',
+                marker=dict(
+                    color='#00E676',  # green indicator
+                    line=dict(width=0)
+                ),
+                text=[f"{value:.1f}"],
+                textposition='outside',
+                textfont=dict(color='white', size=12),
+                showlegend=False,
+                hovertemplate=f'{label}: {value:.1f}<extra></extra>'
+            ),
+            row=row, col=col
+        )
+        
+        # Update axes for each subplot
+        fig.update_yaxes(
+            range=[0, 100],
+            showticklabels=True,
+            tickmode='linear',
+            tick0=0,
+            dtick=50,
+            row=row, col=col
+        )
+        fig.update_xaxes(showticklabels=False, row=row, col=col)
+
+    fig.update_layout(
+        height=700,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=50, b=20),
+        title=dict(text="Radial Civic Score Overview", font=dict(size=22)),
+        barmode='overlay'
+    )
+    
+    return fig
+
+
+def measure(build, samples: list[dict]) -> dict:
+    build(samples[0])  # warm-up (template cache, plotly imports)
+
+    started = time.perf_counter()
+    figures = [build(s) for s in samples]
+    build_ms = (time.perf_counter() - started) * 1000 / len(samples)
+
+    started = time.perf_counter()
+    payloads = [fig.to_json() for fig in figures]
+    json_ms = (time.perf_counter() - started) * 1000 / len(samples)
+
+    return {
+        "traces": len(figures[0].data),
+        "build_ms": round(build_ms, 2),
+        "to_json_ms": round(json_ms, 2),
+        "json_bytes": len(payloads[0]),
+    }
+
+
+def run(n: int = 200):
+    rng = random.Random(0)
+    samples = [{m: round(rng.uniform(0, 100), 1) for m in METRIC_NAMES} for _ in range(n)]
+
+    results = {
+        "samples": n,
+        "before": measure(legacy_plot_radial, samples),
+        "after": measure(plot_radial, samples),
+    }
+
+    print(f"\n📊 Radial chart, {n} figures")
+    for label in ("before", "after"):
+        r = results[label]
+        print(f"   {label:>6}: {r['traces']:>2} traces, {r['build_ms']:.2f} ms build, "
+              f"{r['to_json_ms']:.2f} ms to_json, {r['json_bytes']:,} bytes")
+
+    RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    RESULTS_PATH.write_text(json.dumps(results, indent=2))
+    print(f"💾 Results → {RESULTS_PATH}\n")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
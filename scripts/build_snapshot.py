@@ -0,0 +1,35 @@
+import sys, time
+from pathlib import Path
+
+# --- allow imports of app modules ---
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from db.zip_cache import iter_cached_zips
+from core.snapshot import SNAPSHOT_PATH, build_snapshot, save_snapshot
+from core.percentiles import PERCENTILES_PATH, build_percentile_tables, save_percentile_tables
+
+
+def build():
+    started = time.perf_counter()
+
+    print("\n📥 Reading cached ZIPs from Supabase ...")
+    records = dict(iter_cached_zips())
+    if not records:
+        print("❗ No cached ZIPs found, nothing to build.")
+        return
+
+    print(f"🧮 Scoring {len(records)} ZIPs ...")
+    snapshot = build_snapshot(records)
+    save_snapshot(snapshot)
+    print(f"💾 Snapshot {snapshot.version} → {SNAPSHOT_PATH}")
+
+    tables = build_percentile_tables(snapshot)
+    save_percentile_tables(tables)
+    print(f"💾 Percentile tables ({len(tables['state'])} states) → {PERCENTILES_PATH}")
+
+    print(f"\n✅ Done in {time.perf_counter() - started:.1f}s\n")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,50 @@
+import sys, csv, argparse
+from pathlib import Path
+
+# --- allow imports of app modules ---
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import pandas as pd
+
+from data_sources.zip_validator import ZIP_CROSSWALK_PATH, is_military_zip, is_zcta
+
+
+def build(source: Path, zip_column: str, zcta_column: str):
+    """
+    Writes the ZIP -> ZCTA crosswalk from a ZIP-to-ZCTA table such as the
+    HRSA UDS Mapper crosswalk (.xlsx or .csv). Only ZIPs that are not ZCTAs
+    themselves are kept; military ZIPs and targets that are not ZCTAs are skipped.
+    """
+    print(f"\n📥 Reading {source} ...")
+    if source.suffix.lower() in (".xlsx", ".xls"):
+        df = pd.read_excel(source, dtype=str)
+    else:
+        df = pd.read_csv(source, dtype=str)
+
+    rows, skipped = [], 0
+    for zip_code, zcta in df[[zip_column, zcta_column]].itertuples(index=False):
+        zip_code, zcta = str(zip_code).strip().zfill(5), str(zcta).strip().zfill(5)
+        if is_zcta(zip_code):
+            continue
+        if is_military_zip(zip_code) or not is_zcta(zcta):
+            skipped += 1
+            continue
+        rows.append((zip_code, zcta))
+
+    with open(ZIP_CROSSWALK_PATH, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["zip", "zcta", "note"])
+        writer.writerows((z, c, "") for z, c in sorted(rows))
+
+    print(f"💾 {len(rows)} ZIP → ZCTA rows → {ZIP_CROSSWALK_PATH} ({skipped} skipped)\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the ZIP -> ZCTA crosswalk used by zip_validator.")
+    parser.add_argument("source", type=Path, help="ZIP-to-ZCTA table, e.g. the HRSA UDS Mapper crosswalk")
+    parser.add_argument("--zip-column", default="ZIP_CODE")
+    parser.add_argument("--zcta-column", default="ZCTA")
+    args = parser.parse_args()
+
+    build(args.source, args.zip_column, args.zcta_column)
@@ -0,0 +1,138 @@
+import sys, json, time, argparse, threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# --- allow imports of app modules ---
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from config.settings import DATA_DIR, settings
+from app.personas import PERSONAS
+from core.scoring_engine import score_zip
+from data_sources.uszips import load_uszips
+from db.zip_cache import get_cached_zip
+from llm.llm_client import chat_messages, get_llm_client, get_model_name
+from llm.narrative_cache import lookup_narrative, narrative_key, remember_narrative
+from llm.narrative_generator import NARRATIVE_SYSTEM_PROMPT, build_narrative_prompt
+from llm.providers import estimate_tokens
+from llm.rate_limit import RateGovernor
+
+# Completed (ZIP, persona) keys per state, one JSON line each, so a rerun resumes
+CHECKPOINT_DIR = DATA_DIR / "narrative_jobs"
+
+# Rough completion length used to reserve tokens before the real usage is known
+EXPECTED_COMPLETION_TOKENS = 600
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["key"])
+            except Exception:
+                continue  # partial line from an interrupted run
+    return done
+
+
+def plan_jobs(state: str, personas: list[str], done: set[str]):
+    """
+    (zip, persona, scores, key) for every pair that is neither checkpointed
+    nor already in the narrative cache.
+    """
+    df = load_uszips()
+    zips = sorted(df.loc[df["state_id"].str.upper() == state, "zip"].tolist())
+    print(f"\n🗂️  {len(zips)} ZIP codes in {state}")
+
+    jobs, skipped, uncached = [], 0, 0
+    for zip_code in zips:
+        data = get_cached_zip(zip_code)
+        if not data:
+            uncached += 1
+            continue
+        scores = score_zip(data)
+
+        for persona in personas:
+            key = narrative_key(zip_code, persona, scores)
+            if key in done or lookup_narrative(zip_code, scores, persona) is not None:
+                skipped += 1
+                continue
+            jobs.append((zip_code, persona, scores, key))
+
+    print(f"⏩ {skipped} already generated, {uncached} ZIPs without cached data")
+    return jobs
+
+
+def run(state: str, workers: int, rpm: int, tpm: int, personas: list[str]):
+    checkpoint = CHECKPOINT_DIR / f"{state}.jsonl"
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+
+    jobs = plan_jobs(state, personas, load_checkpoint(checkpoint))
+    if not jobs:
+        print("✅ Nothing to generate\n")
+        return
+
+    pool = get_llm_client()
+    governor = RateGovernor(requests_per_minute=rpm, tokens_per_minute=tpm)
+    lock = threading.Lock()
+    stats = {"done": 0, "failed": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0}
+
+    print(f"🚀 Generating {len(jobs)} narratives with {get_model_name()} "
+          f"({workers} workers, {rpm or '∞'} req/min, {tpm or '∞'} tokens/min)\n")
+
+    def generate(zip_code, persona, scores, key):
+        messages = chat_messages(NARRATIVE_SYSTEM_PROMPT, build_narrative_prompt(zip_code, scores, persona))
+        estimated = estimate_tokens(messages[0]["content"] + messages[1]["content"]) + EXPECTED_COMPLETION_TOKENS
+
+        governor.acquire(estimated)
+        response = pool.complete(messages, site="narrative_batch", persona=persona)
+        governor.settle(estimated, response.total_tokens)
+
+        remember_narrative(zip_code, scores, persona, response.text)
+        with lock:
+            with open(checkpoint, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "zip": zip_code, "persona": persona}) + "\n")
+        return response
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(generate, *job): job for job in jobs}
+
+        for idx, future in enumerate(as_completed(futures), start=1):
+            zip_code, persona = futures[future][:2]
+            try:
+                response = future.result()
+                stats["done"] += 1
+                stats["prompt_tokens"] += response.prompt_tokens
+                stats["completion_tokens"] += response.completion_tokens
+                stats["cost"] += response.cost
+                print(f"💾 [{idx}/{len(jobs)}] {zip_code} / {persona}")
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"❌ [{idx}/{len(jobs)}] {zip_code} / {persona} failed: {e}")
+
+    elapsed = time.perf_counter() - started
+    tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+    print(f"\n📊 {stats['done']} generated, {stats['failed']} failed in {elapsed:.1f}s")
+    print(f"   {stats['done'] / elapsed:.2f} narratives/s, {tokens / elapsed:.0f} tokens/s")
+    print(f"   {stats['prompt_tokens']} prompt + {stats['completion_tokens']} completion tokens")
+    print(f"   ${stats['cost']:.4f} total, ${stats['cost'] / max(stats['done'], 1):.5f} per narrative\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate narratives for every (ZIP, persona) in a state.")
+    parser.add_argument("state", help="2-letter state code, e.g. NJ")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent LLM requests")
+    parser.add_argument("--rpm", type=int, default=500, help="request-per-minute limit (0 = none)")
+    parser.add_argument("--tpm", type=int, default=200_000, help="token-per-minute limit (0 = none)")
+    parser.add_argument("--persona", action="append", choices=PERSONAS, help="limit to these personas")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub provider")
+    args = parser.parse_args()
+
+    if args.stub:
+        settings.LLM_PROVIDER = "stub"
+        settings.LLM_FALLBACK_PROVIDER = None
+
+    run(args.state.upper(), args.workers, args.rpm, args.tpm, args.persona or PERSONAS)
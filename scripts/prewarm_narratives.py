@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+# --- allow imports of app modules ---
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from app.personas import PERSONAS
+from core.scoring_engine import score_zip
+from db.zip_cache import get_cached_zip
+from llm.narrative_cache import prewarm_narratives
+
+
+def _cached_scores(zip_codes):
+    for zip_code in zip_codes:
+        data = get_cached_zip(zip_code)
+        if not data:
+            print(f"⏩ {zip_code} – no cached data, skipping")
+            continue
+        yield zip_code, score_zip(data)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("\n❗ Usage: python prewarm_narratives.py <ZIP> [<ZIP> ...]\nExample: python prewarm_narratives.py 07306 10001\n")
+        sys.exit(1)
+
+    count = prewarm_narratives(_cached_scores(sys.argv[1:]), PERSONAS)
+    print(f"\n✅ Generated {count} narratives\n")
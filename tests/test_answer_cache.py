@@ -0,0 +1,103 @@
+# tests/test_answer_cache.py
+
+import numpy as np
+import pytest
+
+from llm.answer_cache import AnswerCache, EmbeddingMatcher, _Entry, key_tokens, normalize_question
+
+CONTEXT = "10001|Family|abc"
+
+PARAPHRASES = [
+    ("Is this good for families?", "Is it family friendly?"),
+    ("Is this area safe?", "Is it safe here?"),
+    ("What is the crime rate?", "What's the crime rate like?"),
+    ("Is housing affordable?", "Is housing here affordable?"),
+    ("Is it good for a tech startup?", "Is this a good place for a tech startup?"),
+    ("Is it good for kids?", "Is this area good for children?"),
+    ("Is rent cheap here?", "Is rent affordable?"),
+    ("Tell me about the air quality", "What is the air quality like?"),
+]
+
+DIFFERENT = [
+    ("Compare to 07030", "Compare to 07302"),
+    ("Is rent above 2000?", "Is rent above 3000?"),
+    ("Is it safe?", "Isn't it safe?"),
+    ("Is it safe?", "Is it not safe?"),
+    ("Is it good for families?", "Is it good for business?"),
+    ("How are the schools?", "How are the hospitals?"),
+    ("Is it safe?", "Is it safe at night?"),
+    ("Is housing affordable?", "Is broadband affordable?"),
+    ("What is the crime rate?", "What is the poverty rate?"),
+    ("Is the air quality good?", "Is the water quality good?"),
+]
+
+
+def _cache_with(question: str) -> AnswerCache:
+    cache = AnswerCache()
+    cache.store(CONTEXT, question, f"answer to {question}")
+    return cache
+
+
+@pytest.mark.parametrize("stored, asked", PARAPHRASES)
+def test_paraphrase_hits(stored, asked):
+    hit = _cache_with(stored).lookup(CONTEXT, asked)
+    assert hit is not None
+    assert hit.answer == f"answer to {stored}"
+    assert hit.question == stored
+
+
+@pytest.mark.parametrize("stored, asked", DIFFERENT)
+def test_different_questions_miss(stored, asked):
+    assert _cache_with(stored).lookup(CONTEXT, asked) is None
+
+
+def test_other_context_misses():
+    cache = _cache_with("Is it family friendly?")
+    assert cache.lookup("10001|Business|abc", "Is it family friendly?") is None
+
+
+def test_key_tokens_hold_numbers_and_negations():
+    assert key_tokens(normalize_question("Isn't rent above $2,000 near 07030?")) == {"not", "2", "000", "07030"}
+
+
+def test_eviction_keeps_newest_per_context(monkeypatch):
+    from config.settings import settings
+
+    monkeypatch.setattr(settings, "ANSWER_CACHE_MAX_PER_CONTEXT", 2)
+    cache = AnswerCache()
+    for q in ["Is it safe?", "How are the schools?", "Is housing affordable?"]:
+        cache.store(CONTEXT, q, q)
+
+    assert cache.lookup(CONTEXT, "Is it safe?") is None
+    assert cache.lookup(CONTEXT, "Is housing affordable?") is not None
+
+
+def _bag_of_words(vocab):
+    return lambda text: [text.split().count(w) + 1e-3 for w in vocab]
+
+
+def test_embedding_match_indexes_original_entries():
+    matcher = EmbeddingMatcher(_bag_of_words(["school", "safe", "crime"]))
+    entries = [
+        _Entry("How are the schools?", "school", "schools answer", 0.0, None),
+        _Entry("Is it safe?", "safe", "safety answer", 0.0, matcher.embed("safe")),
+        _Entry("Crime?", "crime", "crime answer", 0.0, matcher.embed("crime")),
+    ]
+    index, similarity = matcher.best_match("safe", entries)
+    assert entries[index].answer == "safety answer"
+    assert similarity > 99
+
+
+def test_failed_embedding_is_not_stored():
+    def embed(text):
+        if "school" in text:
+            raise RuntimeError("embedding service down")
+        return _bag_of_words(["school", "safe"])(text)
+
+    cache = AnswerCache(EmbeddingMatcher(embed))
+    cache.store(CONTEXT, "How are the schools?", "schools answer")
+    cache.store(CONTEXT, "Is it safe?", "safety answer")
+
+    hit = cache.lookup(CONTEXT, "Is it safe?")
+    assert hit is not None and hit.answer == "safety answer"
+    assert cache.lookup(CONTEXT, "How are the schools?") is None
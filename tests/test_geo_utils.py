@@ -0,0 +1,93 @@
+# tests/test_geo_utils.py
+
+import numpy as np
+import pytest
+
+from core.geo_utils import EARTH_RADIUS_KM, nearest_zips, zips_within
+from data_sources.uszips import load_uszips
+
+# Distances agree to well under a metre; ZIPs this close to the radius are skipped
+TOLERANCE_KM = 1e-3
+
+
+def _haversine_km(lat, lon, lats, lons) -> np.ndarray:
+    lat, lon, lats, lons = map(np.radians, (lat, lon, lats, lons))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture(scope="module")
+def centroids():
+    df = load_uszips().sort_values("zip")
+    return df["zip"].to_numpy(dtype=str), df["lat"].to_numpy(dtype=float), df["lng"].to_numpy(dtype=float)
+
+
+def _points(centroids, n=40, seed=7):
+    """
+    Random ZIP centroids, jittered points around them, and a few fixed
+    points far from any ZIP (mid-Atlantic, north of Alaska, Pacific).
+    """
+    rng = np.random.default_rng(seed)
+    _, lats, lons = centroids
+    rows = rng.integers(0, len(lats), n)
+    jitter = rng.normal(0, 0.3, (n, 2))
+    points = list(zip(lats[rows] + jitter[:, 0], lons[rows] + jitter[:, 1]))
+    return points + [(35.0, -40.0), (75.0, -150.0), (20.0, -170.0), (61.2, -149.9), (18.4, -66.1)]
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 5, 25, 80, 400])
+def test_zips_within_matches_brute_force(centroids, radius_km):
+    zips, lats, lons = centroids
+
+    for lat, lon in _points(centroids):
+        dist = _haversine_km(lat, lon, lats, lons)
+        expected = set(zips[dist <= radius_km - TOLERANCE_KM])
+        borderline = set(zips[np.abs(dist - radius_km) < TOLERANCE_KM])
+
+        result = zips_within((lat, lon), radius_km)
+        found = {z for z, _ in result}
+
+        assert expected <= found
+        assert found - expected <= borderline
+
+        distances = np.array([d for _, d in result])
+        assert np.all(np.diff(distances) >= 0)
+        rows = np.searchsorted(zips, [z for z, _ in result])
+        np.testing.assert_allclose(distances, dist[rows], atol=TOLERANCE_KM)
+
+
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_nearest_zips_matches_brute_force(centroids, k):
+    zips, lats, lons = centroids
+
+    for lat, lon in _points(centroids, seed=11):
+        dist = _haversine_km(lat, lon, lats, lons)
+        expected = np.sort(dist)[:k]
+
+        result = nearest_zips((lat, lon), k=k)
+        assert len(result) == k
+        distances = [d for _, d in result]
+        np.testing.assert_allclose(distances, expected, atol=TOLERANCE_KM)
+        rows = np.searchsorted(zips, [z for z, _ in result])
+        np.testing.assert_allclose(dist[rows], distances, atol=TOLERANCE_KM)
+
+
+def test_zip_center_includes_itself(centroids):
+    zips, _, _ = centroids
+    for zip_code in ("07030", "10001", "99501", "96813"):
+        if zip_code in zips:
+            assert zips_within(zip_code, 1)[0] == (zip_code, pytest.approx(0.0, abs=TOLERANCE_KM))
+            assert nearest_zips(zip_code, k=1)[0][0] == zip_code
+
+
+@pytest.mark.parametrize("zip_code", ["00000", "99998", "09012", "96201", "34002"])
+def test_zips_without_a_centroid_are_rejected(zip_code):
+    # Never a radius search around a fallback city
+    with pytest.raises(ValueError):
+        zips_within(zip_code, 10)
+    with pytest.raises(ValueError):
+        nearest_zips(zip_code)
+
+
+def test_crosswalk_zip_uses_its_zcta_centroid():
+    assert zips_within("10008", 0.1)[0][0] == "10007"
@@ -0,0 +1,43 @@
+# tests/test_place_index.py
+
+import pytest
+
+from data_sources.place_index import normalize_place, resolve_place
+
+
+@pytest.mark.parametrize("query, city, state", [
+    ("Bozeman MT", "Bozeman", "MT"),
+    ("Bozeman, Montana", "Bozeman", "MT"),
+    ("Hoboken NJ", "Hoboken", "NJ"),
+    ("Jersey City, New Jersey", "Jersey City", "NJ"),
+    ("Mt Vernon NY", "Mount Vernon", "NY"),
+    ("St Louis MO", "Saint Louis", "MO"),
+    ("Ft Lauderdale FL", "Fort Lauderdale", "FL"),
+    ("Portland ME", "Portland", "ME"),
+    ("Portland OR", "Portland", "OR"),
+])
+def test_trailing_state_filters_results(query, city, state):
+    results = resolve_place(query, limit=5)
+    assert results
+    assert results[0]["city"] == city
+    assert results[0]["state"] == state
+
+
+def test_state_abbreviation_is_not_expanded():
+    # "MT" as a trailing state must not turn into "mount"
+    assert all(r["state"] == "MT" for r in resolve_place("Bozeman MT", limit=5)[:2])
+
+
+def test_abbreviations_expand_outside_the_state():
+    assert normalize_place("Mt. Pleasant") == "mount pleasant"
+    assert normalize_place("St Paul") == "saint paul"
+
+
+def test_without_state_matches_nationally():
+    states = {r["state"] for r in resolve_place("Springfield", limit=10)}
+    assert len(states) > 1
+
+
+def test_empty_query_returns_nothing():
+    assert resolve_place("") == []
+    assert resolve_place("  ,  ") == []
@@ -0,0 +1,89 @@
+# tests/test_scoring_batch.py
+
+import numpy as np
+import pytest
+
+from app.personas import PERSONAS, persona_scores, persona_weights
+from core.scoring_engine import build_raw_frame, compute_overall, compute_scores, compute_scores_batch
+
+N_RECORDS = 20_000
+
+
+def _maybe(rng, value, missing=0.05):
+    return None if rng.random() < missing else value
+
+
+def _random_record(rng) -> dict:
+    """
+    One collect_all_data-shaped dict, with missing sections and fields,
+    zero incomes, absent rent burdens and values on rounding ties.
+    """
+    income = float(rng.choice([0, rng.integers(10_000, 200_000), rng.integers(20, 1500) * 100]))
+    record = {
+        "crime": {"crime_per_1k": round(float(rng.uniform(0, 200)), 2)},
+        "health": {
+            "primary_care_centers": int(rng.integers(0, 20)),
+            "hospitals": int(rng.integers(0, 5)),
+            "is_hpsa": bool(rng.random() < 0.3),
+        },
+        "census": {
+            "bachelors_rate": round(float(rng.uniform(0, 90)), int(rng.integers(0, 3))),
+            "median_income": income,
+        },
+        "housing": {
+            "median_rent": float(rng.integers(0, 4000)),
+            "rent_to_income": _maybe(rng, round(float(rng.uniform(0, 0.8)), 3), missing=0.4),
+        },
+        "broadband": {"broadband_pct": round(float(rng.uniform(20, 100)), 1)},
+        "air_quality": {"aqi": int(rng.integers(0, 300))},
+        "osm": {
+            "parks": int(rng.integers(0, 40)),
+            "grocery_stores": int(rng.integers(0, 40)),
+            "clinics": int(rng.integers(0, 20)),
+            "transit_stops": int(rng.integers(0, 100)),
+        },
+    }
+    for section in list(record):
+        if rng.random() < 0.03:
+            del record[section]
+    return record
+
+
+@pytest.fixture(scope="module")
+def records():
+    rng = np.random.default_rng(20240601)
+    return {f"{i:05d}": _random_record(rng) for i in range(N_RECORDS)}
+
+
+@pytest.mark.parametrize("weights", [
+    None,
+    {"Safety": 0.5, "Health": 0.0, "Education": 0.25, "EconomicOpportunity": 1.0,
+     "HousingAffordability": 0.33, "DigitalAccess": 0.1, "Environment": 0.77, "Accessibility": 0.05},
+])
+def test_batch_matches_per_zip(records, weights):
+    batch = compute_scores_batch(build_raw_frame(records), weights)
+
+    for zip_code, data in records.items():
+        expected = compute_scores(data, weights)
+        actual = batch.loc[zip_code].to_dict()
+        assert actual == expected, zip_code
+
+
+def test_empty_record_matches():
+    batch = compute_scores_batch(build_raw_frame({"00000": {}}))
+    assert batch.loc["00000"].to_dict() == compute_scores({})
+
+
+@pytest.mark.parametrize("weights", [
+    None,
+    {"Safety": 0.5, "Health": 0.0, "Education": 0.25, "EconomicOpportunity": 1.0,
+     "HousingAffordability": 0.33, "DigitalAccess": 0.1, "Environment": 0.77, "Accessibility": 0.05},
+])
+def test_persona_scores_match_compute_overall(records, weights):
+    for zip_code, data in records.items():
+        scores = compute_scores(data, weights)
+        by_persona = persona_scores(scores, weights)
+        assert by_persona["General"] == scores["OverallCivicScore"], zip_code
+        for persona in PERSONAS:
+            expected = compute_overall(scores, persona_weights(persona, weights))
+            assert by_persona[persona] == expected, (zip_code, persona)
@@ -0,0 +1,72 @@
+# tests/test_zip_validator.py
+
+import pytest
+
+from data_sources.uszips import load_uszips
+from data_sources.zip_validator import (
+    build_zip_membership,
+    is_military_zip,
+    is_valid_us_zip,
+    is_zcta,
+    load_zip_crosswalk,
+    to_zcta,
+    zip_error,
+)
+
+
+def test_membership_matches_uszips():
+    bitmap = build_zip_membership()
+    zips = set(load_uszips()["zip"])
+    members = {f"{n:05d}" for n in range(100_000) if bitmap[n >> 3] & (1 << (n & 7))}
+    assert members == zips
+
+
+@pytest.mark.parametrize("zip_code", ["07030", "10001", "90210", "99501", "96813", "00601"])
+def test_zctas_are_valid(zip_code):
+    assert is_zcta(zip_code)
+    assert is_valid_us_zip(zip_code)
+    assert to_zcta(zip_code) == zip_code
+
+
+@pytest.mark.parametrize("zip_code, zcta", [
+    ("10008", "10007"),   # Manhattan PO boxes
+    ("00501", "11742"),   # IRS Holtsville, unique ZIP
+])
+def test_crosswalk_zips_are_valid_and_map_to_a_zcta(zip_code, zcta):
+    assert not is_zcta(zip_code)
+    assert is_valid_us_zip(zip_code)
+    assert to_zcta(zip_code) == zcta
+
+
+def test_crosswalk_targets_are_zctas():
+    crosswalk = load_zip_crosswalk()
+    assert crosswalk
+    for zip_code, zcta in crosswalk.items():
+        assert not is_zcta(zip_code)
+        assert is_zcta(zcta)
+
+
+@pytest.mark.parametrize("zip_code", ["09012", "96201", "34002"])
+def test_military_zips_are_rejected_with_a_reason(zip_code):
+    assert is_military_zip(zip_code)
+    assert not is_valid_us_zip(zip_code)
+    assert "military" in zip_error(zip_code)
+    assert to_zcta(zip_code) is None
+
+
+@pytest.mark.parametrize("zip_code", ["99998", "07399", "10099"])
+def test_unassigned_zips_in_used_prefixes_are_rejected(zip_code):
+    # No guessing by prefix: unknown codes never map to a neighbour
+    assert not is_valid_us_zip(zip_code)
+    assert to_zcta(zip_code) is None
+
+
+@pytest.mark.parametrize("zip_code", ["00000", "00100", "99999x", "1234", "123456", "", "abcde", "07030-1234"])
+def test_invalid_zips(zip_code):
+    assert not is_valid_us_zip(zip_code)
+    assert zip_error(zip_code)
+
+
+def test_valid_set_is_zctas_plus_crosswalk():
+    valid = sum(is_valid_us_zip(f"{n:05d}") for n in range(100_000))
+    assert valid == len(set(load_uszips()["zip"])) + len(load_zip_crosswalk())
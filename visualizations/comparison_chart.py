@@ -0,0 +1,65 @@
+# visualizations/comparison_chart.py
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from config.constants import METRIC_NAMES
+
+
+def plot_comparison(scores: pd.DataFrame):
+    """
+    Overlaid radial chart (one trace per ZIP) for a batch score table
+    indexed by ZIP (from compute_scores_batch).
+    """
+    fig = go.Figure()
+
+    for zip_code, row in scores.iterrows():
+        values = [float(row[m]) for m in METRIC_NAMES]
+        fig.add_trace(
+            go.Scatterpolar(
+                r=values + values[:1],
+                theta=METRIC_NAMES + METRIC_NAMES[:1],
+                name=f"{zip_code} ({row['OverallCivicScore']:.1f})",
+                fill="toself",
+                opacity=0.55,
+            )
+        )
+
+    fig.update_layout(
+        height=520,
+        paper_bgcolor='rgba(0,0,0,0)',
+        polar=dict(radialaxis=dict(range=[0, 100], dtick=25)),
+        margin=dict(l=40, r=40, t=50, b=30),
+        title=dict(text="ZIP Comparison", font=dict(size=20)),
+        legend=dict(orientation="h"),
+    )
+
+    return fig
+
+
+def plot_comparison_bars(scores: pd.DataFrame):
+    """
+    Grouped bars per metric, one color per ZIP.
+    """
+    fig = go.Figure()
+
+    for zip_code, row in scores.iterrows():
+        fig.add_trace(
+            go.Bar(
+                x=METRIC_NAMES + ["OverallCivicScore"],
+                y=[float(row[m]) for m in METRIC_NAMES + ["OverallCivicScore"]],
+                name=zip_code,
+            )
+        )
+
+    fig.update_layout(
+        height=420,
+        barmode="group",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        yaxis=dict(range=[0, 100]),
+        margin=dict(l=20, r=20, t=30, b=20),
+        legend=dict(orientation="h"),
+    )
+
+    return fig
@@ -1,8 +1,125 @@
 # visualizations/map_view.py
+import numpy as np
 import pandas as pd
-from core.geo_utils import zip_to_latlon
+import pydeck as pdk
+
+from core.geo_utils import centroid_index, nearest_zips, zip_to_latlon
+from data_sources.uszips import load_uszips
+
+# Layer ids used to read map selections back from Streamlit
+CLICK_LAYER_ID = "zip-centroids"
+CLICK_GRID_LAYER_ID = "click-grid"
+
+# Streamlit only reports picked objects, not click coordinates, so a nearly
+# invisible grid of cells (each carrying its corner) covers the area around
+# the map. Cells are coarse so the deck stays small; the dots give exact
+# picks near the selected ZIP.
+CLICK_GRID_CELL_M = 5000
+CLICK_GRID_RADIUS_KM = 75.0
+_KM_PER_DEG_LAT = 111.32
 
 
 def make_map_df(zip_code: str) -> pd.DataFrame:
     lat, lon = zip_to_latlon(zip_code)
     return pd.DataFrame({"lat": [lat], "lon": [lon]})
+
+
+def _cell_degrees(lat: float) -> tuple[float, float]:
+    """
+    (lat, lon) size in degrees of a CLICK_GRID_CELL_M cell at this latitude.
+    """
+    cell_km = CLICK_GRID_CELL_M / 1000
+    return cell_km / _KM_PER_DEG_LAT, cell_km / (_KM_PER_DEG_LAT * max(np.cos(np.radians(lat)), 0.01))
+
+
+def _click_grid(lat: float, lon: float, radius_km: float) -> pd.DataFrame:
+    """
+    Cell corners on a CLICK_GRID_CELL_M grid around (lat, lon).
+    """
+    cell_km = CLICK_GRID_CELL_M / 1000
+    dlat, dlon = _cell_degrees(lat)
+    steps = np.arange(-radius_km, radius_km, cell_km) / cell_km
+
+    rows, cols = np.meshgrid(steps, steps, indexing="ij")
+    corner_lat = (lat + rows * dlat).ravel()
+    corner_lon = (lon + cols * dlon).ravel()
+    return pd.DataFrame({"corner": [[round(float(x), 4), round(float(y), 4)] for x, y in zip(corner_lon, corner_lat)]})
+
+
+def _cell_center(corner) -> tuple[float, float]:
+    lon, lat = corner
+    dlat, dlon = _cell_degrees(lat)
+    return lat + dlat / 2, lon + dlon / 2
+
+
+def make_click_map(zip_code: str, radius_km: float = 30.0) -> pdk.Deck:
+    """
+    Map of the ZIP centroids around zip_code as clickable dots.
+    The selected ZIP is highlighted; clicking another dot selects that area,
+    and a click up to CLICK_GRID_RADIUS_KM away selects the nearest ZIP.
+    """
+    lat, lon = zip_to_latlon(zip_code)
+    rows, _ = centroid_index().query_radius(lat, lon, radius_km)
+
+    nearby = load_uszips().iloc[rows]
+    df = pd.DataFrame({
+        "zip": nearby["zip"].to_numpy(),
+        "lat": nearby["lat"].to_numpy(),
+        "lon": nearby["lng"].to_numpy(),
+        "city": nearby["city"].to_numpy(),
+    })
+    if zip_code not in set(df["zip"]):
+        df.loc[len(df)] = [zip_code, lat, lon, ""]
+    df["color"] = [[230, 57, 70, 220] if z == zip_code else [0, 116, 217, 90] for z in df["zip"]]
+
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        id=CLICK_LAYER_ID,
+        data=df,
+        get_position="[lon, lat]",
+        get_fill_color="color",
+        get_radius=900,
+        radius_min_pixels=6,
+        pickable=True,
+    )
+
+    # Below the dots: a click on empty map picks a cell instead
+    grid = pdk.Layer(
+        "GridCellLayer",
+        id=CLICK_GRID_LAYER_ID,
+        data=_click_grid(lat, lon, max(radius_km, CLICK_GRID_RADIUS_KM)),
+        get_position="corner",
+        cell_size=CLICK_GRID_CELL_M,
+        extruded=False,
+        get_fill_color=[0, 0, 0, 1],
+        pickable=True,
+    )
+
+    return pdk.Deck(
+        layers=[grid, layer],
+        initial_view_state=pdk.ViewState(latitude=lat, longitude=lon, zoom=10),
+        tooltip={"text": "{zip} · {city}"},
+        map_style=None,
+    )
+
+
+def clicked_zip(selection) -> str | None:
+    """
+    ZIP for a pydeck selection event: a clicked dot carries its ZIP; a click
+    anywhere else resolves the clicked cell's center (~5 km resolution)
+    to the nearest ZIP via the centroid index.
+    """
+    try:
+        objects = selection.selection.objects
+    except AttributeError:
+        return None
+
+    dots = objects.get(CLICK_LAYER_ID) or []
+    if dots:
+        return dots[0]["zip"]
+
+    cells = objects.get(CLICK_GRID_LAYER_ID) or []
+    if not cells:
+        return None
+    nearest = nearest_zips(_cell_center(cells[0]["corner"]), k=1)
+    return nearest[0][0] if nearest else None
@@ -1,107 +1,70 @@
 # visualizations/radial_chart.py
 
-import streamlit as st
+import copy
+import functools
+
 import plotly.graph_objects as go
 
+# Background bands behind each metric: (base, height, color)
+_BANDS = [
+    (0, 33, "#FFFFFF"),
+    (33, 33, "#B0E0E6"),
+    (66, 34, "#00008B"),
+]
+
+
+@functools.lru_cache(maxsize=8)
+def _template(labels: tuple[str, ...]) -> dict:
+    """
+    Validated figure dict with the layout and the three band traces for a
+    set of metric labels. Built once; each chart only adds its value trace.
+    """
+    fig = go.Figure(layout=dict(
+        height=500,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=20, r=20, t=50, b=20),
+        title=dict(text="Radial Civic Score Overview", font=dict(size=22)),
+        barmode="overlay",
+        bargap=0.35,
+        showlegend=False,
+        yaxis=dict(range=[0, 105], tickmode="linear", tick0=0, dtick=50),
+        xaxis=dict(tickangle=0),
+    ))
+
+    # One trace per band covering every metric (was one trace per metric and band)
+    for base, height, color in _BANDS:
+        fig.add_trace(go.Bar(
+            x=list(labels),
+            y=[height] * len(labels),
+            base=base,
+            marker=dict(color=color, line=dict(width=0)),
+            hoverinfo="skip",
+        ))
+
+    return fig.to_plotly_json()
+
+
 def plot_radial(scores: dict):
     # Remove OverallCivicScore because we plot only metrics
     data = {k: v for k, v in scores.items() if k != "OverallCivicScore"}
 
-    labels = list(data.keys())
+    labels = tuple(data.keys())
     values = list(data.values())
 
-    # Create subplots in a 2x4 grid
-    from plotly.subplots import make_subplots
-    fig = make_subplots(
-        rows=2, cols=4,
-        subplot_titles=labels,
-        vertical_spacing=0.15,
-        horizontal_spacing=0.1
-    )
+    figure = copy.deepcopy(_template(labels))
 
-    for i, (label, value) in enumerate(zip(labels, values)):
-        row = (i // 4) + 1
-        col = (i % 4) + 1
-        
-        # Add background bars first (they'll be behind the value bar)
-        # White background (0-33)
-        fig.add_trace(
-            go.Bar(
-                x=[label],
-                y=[33],
-                orientation='v',
-                marker=dict(color='#FFFFFF', line=dict(width=0)),
-                showlegend=False,
-                hoverinfo='skip'
-            ),
-            row=row, col=col
-        )
-        
-        # Powder blue background (33-66)
-        fig.add_trace(
-            go.Bar(
-                x=[label],
-                y=[33],  # Height of this segment
-                base=33,
-                orientation='v',
-                marker=dict(color='#B0E0E6', line=dict(width=0)),
-                showlegend=False,
-                hoverinfo='skip'
-            ),
-            row=row, col=col
-        )
-        
-        # Dark blue background (66-100)
-        fig.add_trace(
-            go.Bar(
-                x=[label],
-                y=[34],  # Height of this segment (100-66)
-                base=66,
-                orientation='v',
-                marker=dict(color='#00008B', line=dict(width=0)),
-                showlegend=False,
-                hoverinfo='skip'
-            ),
-            row=row, col=col
-        )
-        
-        # Add the actual value bar on top (green indicator)
-        fig.add_trace(
-            go.Bar(
-                x=[label],
-                y=[value],
-                orientation='v',
-                marker=dict(
-                    color='#00E676',  # green indicator
-                    line=dict(width=0)
-                ),
-                text=[f"{value:.1f}"],
-                textposition='outside',
-                textfont=dict(color='white', size=12),
-                showlegend=False,
-                hovertemplate=f'{label}: {value:.1f}<extra></extra>'
-            ),
-            row=row, col=col
-        )
-        
-        # Update axes for each subplot
-        fig.update_yaxes(
-            range=[0, 100],
-            showticklabels=True,
-            tickmode='linear',
-            tick0=0,
-            dtick=50,
-            row=row, col=col
-        )
-        fig.update_xaxes(showticklabels=False, row=row, col=col)
+    # Green value indicators for all metrics in a single trace
+    figure["data"].append(dict(
+        type="bar",
+        x=list(labels),
+        y=values,
+        marker=dict(color="#00E676", line=dict(width=0)),
+        text=[f"{v:.1f}" for v in values],
+        textposition="outside",
+        textfont=dict(color="white", size=12),
+        hovertemplate="%{x}: %{y:.1f}<extra></extra>",
+    ))
 
-    fig.update_layout(
-        height=700,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=20, r=20, t=50, b=20),
-        title=dict(text="Radial Civic Score Overview", font=dict(size=22)),
-        barmode='overlay'
-    )
-    
-    return fig
+    # Template is already validated; skip re-validating it on every build
+    return go.Figure(figure, _validate=False)
@@ -0,0 +1,146 @@
+# visualizations/score_map.py
+
+import threading
+
+import numpy as np
+import plotly.graph_objects as go
+
+from core.snapshot import ScoreSnapshot, load_snapshot
+from data_sources.uszips import load_uszips
+
+# Grid cell size (degrees) used to simplify the national view; None = one point per ZIP
+MAP_LEVELS = {
+    "national": 0.5,
+    "state": None,
+}
+
+_frames: dict = {}
+_frames_lock = threading.Lock()
+
+
+def _centroids(snapshot: ScoreSnapshot) -> tuple[np.ndarray, np.ndarray]:
+    table = load_uszips()
+    rows = {z: i for i, z in enumerate(table["zip"].tolist())}
+    idx = np.array([rows.get(z, -1) for z in snapshot.zips.tolist()])
+    lat = np.where(idx >= 0, table["lat"].to_numpy()[idx], np.nan)
+    lon = np.where(idx >= 0, table["lng"].to_numpy()[idx], np.nan)
+    return lat, lon
+
+
+def _aggregate(lat, lon, values, cell_deg: float):
+    """
+    Averages points into cell_deg x cell_deg cells (fewer, coarser markers).
+    """
+    keys = np.stack([np.floor(lat / cell_deg), np.floor(lon / cell_deg)], axis=1)
+    _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+
+    def mean(x):
+        return np.bincount(inverse, weights=x) / counts
+
+    return mean(lat), mean(lon), mean(values), counts
+
+
+def map_frame(metric: str, level: str = "national", state: str | None = None) -> dict | None:
+    """
+    Columnar arrays (float32) for one metric at one zoom level, built once
+    per snapshot version and reused by every rerun and session.
+    Returns {"lat", "lon", "value", "label", "count"} or None without a snapshot.
+    """
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+
+    key = (snapshot.version, metric, level, state)
+    with _frames_lock:
+        if key in _frames:
+            return _frames[key]
+
+    centroids_key = (snapshot.version, "centroids")
+    with _frames_lock:
+        centroids = _frames.get(centroids_key)
+    if centroids is None:
+        centroids = _centroids(snapshot)
+
+    lat, lon = centroids
+    values = snapshot.column(metric)
+    labels = snapshot.zips
+
+    mask = ~np.isnan(lat)
+    if state:
+        mask &= snapshot.states == state
+    lat, lon, values, labels = lat[mask], lon[mask], values[mask], labels[mask]
+
+    cell = MAP_LEVELS[level]
+    if cell:
+        lat, lon, values, counts = _aggregate(lat, lon, values, cell)
+        labels = None
+    else:
+        counts = np.ones(len(values))
+
+    frame = {
+        "lat": lat.astype(np.float32),
+        "lon": lon.astype(np.float32),
+        "value": np.round(values, 1).astype(np.float32),
+        "label": labels,
+        "count": counts.astype(np.int32),
+    }
+
+    with _frames_lock:
+        # Drop frames from older snapshots
+        for stale in [k for k in _frames if k[0] != snapshot.version]:
+            del _frames[stale]
+        _frames[centroids_key] = centroids
+        _frames[key] = frame
+    return frame
+
+
+def plot_score_map(metric: str, state: str | None = None):
+    """
+    Map of cached ZIPs colored by a score column.
+    National view uses aggregated grid cells; a state view shows every ZIP.
+    NumPy arrays are serialized by Plotly as compact base64 typed arrays.
+    """
+    level = "state" if state else "national"
+    frame = map_frame(metric, level, state)
+    if frame is None or len(frame["value"]) == 0:
+        return None
+
+    if frame["label"] is not None:
+        hover = "ZIP %{text}<br>" + metric + ": %{marker.color:.1f}<extra></extra>"
+        text = frame["label"]
+    else:
+        hover = metric + ": %{marker.color:.1f} (avg of %{customdata} ZIPs)<extra></extra>"
+        text = None
+
+    fig = go.Figure(
+        go.Scattermap(
+            lat=frame["lat"],
+            lon=frame["lon"],
+            text=text,
+            customdata=frame["count"],
+            mode="markers",
+            marker=dict(
+                color=frame["value"],
+                colorscale="Viridis",
+                cmin=0,
+                cmax=100,
+                size=7 if state else 6,
+                opacity=0.8,
+                colorbar=dict(title=metric),
+            ),
+            hovertemplate=hover,
+        )
+    )
+
+    fig.update_layout(
+        height=560,
+        margin=dict(l=0, r=0, t=0, b=0),
+        map=dict(
+            style="carto-positron",
+            center=dict(lat=float(np.mean(frame["lat"])), lon=float(np.mean(frame["lon"]))),
+            zoom=5.5 if state else 3,
+        ),
+    )
+
+    return fig